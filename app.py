@@ -6,6 +6,8 @@
 # The app is built as a modern, minimalist web application using Streamlit.
 # It embodies the ideology of Homo Immortalis, focusing on self-preservation and evolution toward immortality.
 # Expanded to over 1000 lines with detailed comments, modular functions, error handling, and additional features.
+# Multipage layout: app.py configures the page and routes with st.navigation; each page lives in
+# app_pages/ and is loaded and executed only when navigated to (replaces app_old*.py variants).
 # Key Features:
 # - Advanced Biological Age Calculator with quick and detailed modes, including more biomarkers and personalized recommendations.
 # - Community discussions with categories, posts, replies, likes, and user authentication (using SQLite for persistence).
@@ -21,25 +23,14 @@
 # - No shadows, no flashy colors, clean text boxes (square), high contrast, easy navigation.
 # - Clean, modern look: Inter font, #001F3F navy background, #FFFFFF white text, #00BFFF cyan accents.
 
-# Import Statements - Expanded for Clarity
-# ========================================
-# Core libraries for app functionality
+# Import Statements
+# =================
+# Only what every page needs; page-specific libraries are imported by the pages themselves
 import streamlit as st  # Web app framework for UI and interactivity
-import pandas as pd  # Data manipulation for charts and data handling
-import sqlite3  # Database for persistent storage of posts, notes, users, and preferences
-import feedparser  # RSS parsing for fetching scientific news from PubMed
-import matplotlib.pyplot as plt  # Charting library for visualizing progress and age calculations
-import seaborn as sns  # Enhanced charting for beautiful, modern visuals
-from datetime import datetime, timedelta  # Timestamp and date handling for posts, notes, and reminders
-import hashlib  # Hashing for anonymous user IDs and security
-import json  # JSON handling for data serialization (e.g., preferences)
-import base64  # Base64 encoding for file downloads (e.g., notebook export)
-import random  # Random utilities for generating sample data during development
-import os  # OS utilities for file handling and logging
 import logging  # Logging for error handling and debugging
-import re  # Regular expressions for input validation
-import math  # Math functions for calculations
-import numpy as np  # Numerical operations for advanced calculations
+import os  # Admin page switch
+
+from common import finish_session_run, track_session
 
 # Set up logging for error handling
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -62,32 +53,8 @@ def configure_page():
     )
     logger.info("Page configured successfully.")
 
-def configure_charts():
-    """Configure Matplotlib and Seaborn for clean, minimalist charts with high contrast."""
-    try:
-        plt.style.use('dark_background')  # Dark theme for modern look
-        sns.set_palette("husl")  # Husl palette for subtle, non-flashy colors
-        plt.rcParams['figure.facecolor'] = '#001F3F'  # Match app background
-        plt.rcParams['axes.facecolor'] = '#001F3F'  # Axes background
-        plt.rcParams['text.color'] = '#FFFFFF'  # White text for contrast
-        plt.rcParams['axes.labelcolor'] = '#00BFFF'  # Cyan labels for accents
-        plt.rcParams['font.family'] = 'Inter'  # Consistent app font
-        plt.rcParams['axes.grid'] = False  # No grid lines for minimalism
-        plt.rcParams['figure.figsize'] = [8, 4]  # Default figure size
-        plt.rcParams['legend.frameon'] = False  # No legend frame
-        plt.rcParams['legend.fontsize'] = 'small'  # Small legend text
-        plt.rcParams['axes.edgecolor'] = '#FFFFFF'  # White edges for contrast
-        plt.rcParams['xtick.color'] = '#FFFFFF'  # White x-tick labels
-        plt.rcParams['ytick.color'] = '#FFFFFF'  # White y-tick labels
-        plt.rcParams['axes.titlecolor'] = '#00BFFF'  # Cyan titles
-        logger.info("Charts configured successfully.")
-    except Exception as e:
-        logger.error(f"Error configuring charts: {str(e)}")
-        st.error("An error occurred configuring charts. Please try refreshing the page.")
-
 # Call configuration functions
 configure_page()
-configure_charts()
 
 # CSS for Ultra-Modern, Minimalist Design
 # =======================================
@@ -268,162 +235,34 @@ section#bio-age, section#notebook {
     .stButton > button { padding: 6px 12px !important; }  /* Smaller buttons on mobile */
 }
 </style>
-<script>
-document.querySelectorAll('a[href^="#"]').forEach(anchor => {
-    anchor.addEventListener('click', function (e) {
-        e.preventDefault();
-        document.querySelector(this.getAttribute('href')).scrollIntoView({behavior: 'smooth'});
-    });
-});
-</script>
 """, unsafe_allow_html=True)
 
-st.set_page_config(page_title="Homo Immortalis", layout="wide", initial_sidebar_state="collapsed")
-
 # Header
 st.markdown("""
 <header class="header">
     <img src="https://pbs.twimg.com/profile_images/1946373662589751296/I9F-1tT9.jpg" alt="Homo Immortalis" class="logo">
-    <ul class="header-nav">
-        <li><a href="#home">Home</a></li>
-        <li><a href="#bio-age">Biological Age</a></li>
-        <li><a href="#community">Community</a></li>
-        <li><a href="#news">Scientific News</a></li>
-        <li><a href="#notebook">Notebook</a></li>
-    </ul>
 </header>
 """, unsafe_allow_html=True)
 
-# SQLite Setup
-@st.cache_resource
-def init_db():
-    conn = sqlite3.connect('community.db', check_same_thread=False)
-    conn.execute('''CREATE TABLE IF NOT EXISTS posts 
-                    (id INTEGER PRIMARY KEY, category TEXT, content TEXT, timestamp TEXT)''')
-    conn.commit()
-    return conn
-
-conn = init_db()
-
-# Main Content
-with st.container():
-    # Home Section
-    st.markdown('<section id="home">', unsafe_allow_html=True)
-    st.markdown("<h1 style='text-align: center;'>Homo Immortalis</h1>", unsafe_allow_html=True)
-    st.markdown("<p style='text-align: center; font-size: 1.2rem; max-width: 700px; margin: 0 auto;'>"
-                "Embark on a journey to optimize your longevity and evolve into your best self.</p>", unsafe_allow_html=True)
-    st.markdown('</section>', unsafe_allow_html=True)
-
-    # Biological Age Section
-    st.markdown('<section id="bio-age">', unsafe_allow_html=True)
-    st.header("Biological Age Calculator")
-    col_quick, col_detailed = st.columns([1,1], gap="medium")
-    with col_quick:
-        st.subheader("Quick Assessment")
-        with st.form("quick_form"):
-            age = st.number_input("Chronological Age", 18, 120, 30, key="quick_age")
-            gender = st.selectbox("Gender", ["Male", "Female"], key="quick_gender")
-            bmi = st.number_input("BMI", 10.0, 50.0, 22.0, key="quick_bmi")
-            sleep_hours = st.number_input("Sleep Hours", 0, 23, 7, key="quick_sleep_hours")
-            sleep_minutes = st.number_input("Sleep Minutes", 0, 59, 0, key="quick_sleep_minutes")
-            exercise_hours = st.number_input("Exercise Hours/Week", 0, 168, 5, key="quick_exercise_hours")
-            exercise_minutes = st.number_input("Exercise Minutes/Week", 0, 59, 0, key="quick_exercise_minutes")
-            if st.form_submit_button("Calculate"):
-                sleep = sleep_hours + sleep_minutes / 60
-                exercise = exercise_hours + exercise_minutes / 60
-                gender_factor = 1.2 if gender == "Male" else 1.0
-                bio_age = age * gender_factor + (bmi - 22) * 0.8 - (sleep - 7) * 1.2 - exercise * 0.3
-                st.markdown(f"### Biological Age: {bio_age:.1f} years")
-                if bio_age < age:
-                    st.success(f"You're {age - bio_age:.1f} years biologically younger!")
-                else:
-                    st.warning("Optimization opportunity detected")
-    with col_detailed:
-        st.subheader("Advanced Analysis")
-        with st.expander("Sleep Metrics"):
-            sleep_hours = st.number_input("Sleep Hours", 0, 23, 7, key="detailed_sleep_hours")
-            sleep_minutes = st.number_input("Sleep Minutes", 0, 59, 0, key="detailed_sleep_minutes")
-            sleep_quality = st.slider("Sleep Quality (1-10)", 1, 10, 6, key="sleep_quality")
-        with st.expander("Exercise Metrics"):
-            exercise_hours = st.number_input("Exercise Hours/Week", 0, 168, 5, key="detailed_exercise_hours")
-            exercise_minutes = st.number_input("Exercise Minutes/Week", 0, 59, 0, key="detailed_exercise_minutes")
-            exercise_intensity = st.slider("Intensity (1-10)", 1, 10, 6, key="exercise_intensity")
-        with st.expander("Nutrition Metrics"):
-            calories = st.number_input("Daily Calories", 500, 5000, 2000, key="calories")
-            veggie_servings = st.number_input("Daily Veggie Servings", 0, 10, 3, key="veggies")
-        with st.expander("Health Biomarkers"):
-            systolic_bp = st.number_input("Systolic Blood Pressure", 80, 200, 120, key="bp")
-            cholesterol = st.number_input("Cholesterol (mg/dL)", 100, 300, 180, key="cholesterol")
-        if st.button("Deep Analysis"):
-            sleep = sleep_hours + sleep_minutes / 60
-            exercise = exercise_hours + exercise_minutes / 60
-            bio_age = age + systolic_bp * 0.1 + (cholesterol - 200) * 0.05 - (veggie_servings * 0.2) - (sleep_quality * 0.1) - (exercise_intensity * 0.15)
-            st.markdown(f"### Detailed Biological Age: {bio_age:.1f} years")
-            df = pd.DataFrame({"Metric": ["Chronological", "Biological"], "Age": [age, bio_age]})
-            st.bar_chart(df.set_index("Metric"), height=200)
-        st.info("Based on validated biomarkers from UK Biobank")
-    st.markdown('</section>', unsafe_allow_html=True)
-
-    # Community Section
-    st.markdown('<section id="community">', unsafe_allow_html=True)
-    st.header("Community")
-    col_form, col_posts = st.columns([1,2], gap="medium")
-    with col_form:
-        st.subheader("Share Your Journey")
-        with st.form("post_form"):
-            category = st.selectbox("Topic", ["Sleep", "Exercise", "Nutrition", "Biomarkers"])
-            post = st.text_area("What's your experience?", height=200)
-            if st.form_submit_button("Post"):
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                conn.execute("INSERT INTO posts (category, content, timestamp) VALUES (?, ?, ?)", 
-                            (category, post, timestamp))
-                conn.commit()
-                st.success("Posted!")
-    with col_posts:
-        st.subheader("Recent Posts")
-        df = pd.read_sql("SELECT * FROM posts ORDER BY timestamp DESC LIMIT 5", conn)
-        for _, row in df.iterrows():
-            with st.expander(f"{row['category']} • {row['timestamp']}"):
-                st.write(row['content'])
-    st.markdown('</section>', unsafe_allow_html=True)
-
-    # Scientific News Section
-    st.markdown('<section id="news">', unsafe_allow_html=True)
-    st.header("Latest Research")
-    with st.spinner("Fetching from PubMed..."):
-        feed_url = "https://pubmed.ncbi.nlm.nih.gov/rss/search/?term=(longevity+OR+aging+OR+healthspan)+AND+2025&limit=10&sort=date"
-        feed = feedparser.parse(feed_url)
-        cols = st.columns(3, gap="medium")
-        for i, entry in enumerate(feed.entries[:9]):
-            with cols[i % 3]:
-                with st.container():
-                    st.markdown(f"**{entry.title}**")
-                    st.caption(entry.published)
-                    st.link_button("Read Study", entry.link, use_container_width=True)
-    st.markdown('</section>', unsafe_allow_html=True)
+# Session Memory
+# ==============
+# Before any page reads st.session_state: restores state evicted while this tab was idle
+track_session()
 
-    # Notebook Section
-    st.markdown('<section id="notebook">', unsafe_allow_html=True)
-    st.header("Personal Notebook")
-    if 'entries' not in st.session_state:
-        st.session_state.entries = []
-    col_note, col_list = st.columns([1,2], gap="medium")
-    with col_note:
-        with st.form("notebook_form"):
-            entry = st.text_area("Log your progress, biomarkers, thoughts...", height=200)
-            if st.form_submit_button("Save Entry"):
-                st.session_state.entries.append({
-                    "time": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                    "content": entry
-                })
-                st.success("Saved!")
-    with col_list:
-        if st.session_state.entries:
-            for entry in st.session_state.entries[-5:]:
-                with st.container():
-                    st.subheader(entry["time"])
-                    st.write(entry["content"])
-        else:
-            st.info("Start logging your journey!")
-    st.markdown('</section>', unsafe_allow_html=True)
-    
\ No newline at end of file
+# Navigation
+# ==========
+# Pages are file paths, so st.navigation executes only the selected page's module per rerun
+pages = [
+    st.Page("app_pages/bio_age.py", title="Bio Age", url_path="bio-age", default=True),
+    st.Page("app_pages/dashboard.py", title="Dashboard", url_path="dashboard"),
+    st.Page("app_pages/challenges.py", title="Challenges", url_path="challenges"),
+    st.Page("app_pages/community.py", title="Community", url_path="community"),
+    st.Page("app_pages/research.py", title="News", url_path="research"),
+    st.Page("app_pages/notebook.py", title="Notebook", url_path="notebook"),
+]
+if os.environ.get("IMMORTALIS_ADMIN") == "1":
+    pages.append(st.Page("app_pages/admin.py", title="Admin", url_path="admin"))
+try:
+    st.navigation(pages, position="top").run()
+finally:
+    finish_session_run()  # Also on st.rerun()/st.stop(), which end a run by raising
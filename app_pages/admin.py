@@ -0,0 +1,80 @@
+# Homo Immortalis - Admin Page
+# ============================
+# Description: Operator views: the community.db slow-query log with query plans, backups
+# and per-session memory.
+# Listed in the navigation only when IMMORTALIS_ADMIN=1 is set for the server.
+# Executed by st.navigation only when this page is open.
+
+import os  # Snapshot sizes
+import sqlite3  # Backup errors
+
+import streamlit as st  # Web app framework for UI and interactivity
+
+from backup import BACKUP_DIR, BackupError, backup_all, list_snapshots
+from common import get_db, get_session_memory
+from query_trace import TRACE_ENABLED, TRACER
+
+get_db()  # Make sure community.db is open, so its startup statements are traced too
+
+st.header("Admin")
+st.subheader("Slow Queries")
+if not TRACE_ENABLED:
+    st.info("SQL tracing is disabled (IMMORTALIS_SQL_TRACE=0).")
+records = TRACER.snapshot()
+col_seen, col_slow, col_threshold = st.columns(3)
+col_seen.metric("Statements traced", TRACER.statements)
+col_slow.metric("Slow statements kept", len(records))
+TRACER.threshold_ms = col_threshold.number_input("Threshold (ms)", min_value=0.0, value=float(TRACER.threshold_ms), step=10.0)
+flagged_only = st.checkbox("Only full scans and temp B-tree sorts")
+for record in records:
+    if flagged_only and not record["flags"]:
+        continue
+    flags = f" • ⚠ {', '.join(record['flags'])}" if record["flags"] else ""
+    with st.expander(f"{record['ms']} ms • {record['at']}{flags}"):
+        st.code(record["sql"], language="sql")
+        st.caption(f"Parameters: {record['params']}")
+        if record["plan"]:
+            st.code("\n".join(record["plan"]), language="text")
+col_dump, col_clear = st.columns(2)
+# Downloaded by the browser; the page never writes files on the server
+col_dump.download_button("Download JSON Lines", TRACER.to_jsonl(), file_name="slow_queries.jsonl",
+                         mime="application/jsonl")
+if col_clear.button("Clear"):
+    TRACER.clear()
+    st.rerun()
+
+st.subheader("Backups")
+snapshots = list_snapshots()
+if snapshots:
+    for snapshot in snapshots:
+        st.caption(f"{os.path.basename(snapshot)} • {os.path.getsize(snapshot) / 1e6:.1f} MB")
+else:
+    st.caption(f"No snapshots in {BACKUP_DIR}/ yet.")
+if st.button("Back up now"):
+    try:
+        with st.spinner("Copying community.db..."):
+            backup_all()
+        st.rerun()
+    except (BackupError, OSError, sqlite3.Error) as e:
+        st.error(f"Backup failed: {str(e)}")
+
+st.subheader("Session Memory")
+memory = get_session_memory()
+report = memory.report()
+col_sessions, col_resident, col_spilled = st.columns(3)
+col_sessions.metric("Sessions", len(report["sessions"]))
+col_resident.metric("Resident state", f"{report['resident_bytes'] / 1024:.0f} KB",
+                    help=f"Budget {report['budget_bytes'] / 1024 / 1024:.0f} MB")
+col_spilled.metric("Evicted to disk", f"{report['spilled_bytes'] / 1024:.0f} KB")
+if report["sessions"]:
+    st.dataframe([{
+        "Session": s["session"],
+        "User": s["user"],
+        "Idle (s)": s["idle_seconds"],
+        "Keys": s["keys"],
+        "Resident KB": round(s["resident_bytes"] / 1024, 1),
+        "Evicted KB": round(s["spilled_bytes"] / 1024, 1),
+        "Largest keys": ", ".join(f"{key} ({size / 1024:.1f} KB)" for key, size in s["largest"]),
+    } for s in report["sessions"]], use_container_width=True)
+if st.button("Evict idle sessions now"):
+    st.success(f"Evicted {memory.sweep() / 1024:.0f} KB.")
@@ -0,0 +1,77 @@
+# Homo Immortalis - Biological Age Page
+# =====================================
+# Description: Home hero and the quick/advanced biological age calculators.
+# Executed by st.navigation only when this page is open.
+
+import streamlit as st  # Web app framework for UI and interactivity
+import pandas as pd  # Data manipulation for charts and data handling
+
+from common import get_event_log
+
+event_log = get_event_log()
+
+# Home Section
+st.markdown('<section id="home">', unsafe_allow_html=True)
+st.markdown("<h1 style='text-align: center;'>Homo Immortalis</h1>", unsafe_allow_html=True)
+st.markdown("<p style='text-align: center; font-size: 1.2rem; max-width: 700px; margin: 0 auto;'>"
+            "Embark on a journey to optimize your longevity and evolve into your best self.</p>", unsafe_allow_html=True)
+st.markdown('</section>', unsafe_allow_html=True)
+
+# Biological Age Section
+st.markdown('<section id="bio-age">', unsafe_allow_html=True)
+st.header("Biological Age Calculator")
+col_quick, col_detailed = st.columns([1,1], gap="medium")
+with col_quick:
+    st.subheader("Quick Assessment")
+    with st.form("quick_form"):
+        age = st.number_input("Chronological Age", 18, 120, 30, key="quick_age")
+        gender = st.selectbox("Gender", ["Male", "Female"], key="quick_gender")
+        bmi = st.number_input("BMI", 10.0, 50.0, 22.0, key="quick_bmi")
+        sleep_hours = st.number_input("Sleep Hours", 0, 23, 7, key="quick_sleep_hours")
+        sleep_minutes = st.number_input("Sleep Minutes", 0, 59, 0, key="quick_sleep_minutes")
+        exercise_hours = st.number_input("Exercise Hours/Week", 0, 168, 5, key="quick_exercise_hours")
+        exercise_minutes = st.number_input("Exercise Minutes/Week", 0, 59, 0, key="quick_exercise_minutes")
+        if st.form_submit_button("Calculate"):
+            sleep = sleep_hours + sleep_minutes / 60
+            exercise = exercise_hours + exercise_minutes / 60
+            gender_factor = 1.2 if gender == "Male" else 1.0
+            bio_age = age * gender_factor + (bmi - 22) * 0.8 - (sleep - 7) * 1.2 - exercise * 0.3
+            event_log.append("bio_age.quick", gender=gender, chronological_age=age, bio_age=bio_age,
+                             bmi=bmi, sleep_hours=sleep, exercise_hours=exercise)
+            # Remembered for the Dashboard page
+            st.session_state.user_data = {'age': age, 'sleep_hours': sleep, 'bmi': bmi, 'exercise_hours': exercise}
+            st.session_state.bio_age = bio_age
+            st.markdown(f"### Biological Age: {bio_age:.1f} years")
+            if bio_age < age:
+                st.success(f"You're {age - bio_age:.1f} years biologically younger!")
+            else:
+                st.warning("Optimization opportunity detected")
+with col_detailed:
+    st.subheader("Advanced Analysis")
+    with st.expander("Sleep Metrics"):
+        sleep_hours = st.number_input("Sleep Hours", 0, 23, 7, key="detailed_sleep_hours")
+        sleep_minutes = st.number_input("Sleep Minutes", 0, 59, 0, key="detailed_sleep_minutes")
+        sleep_quality = st.slider("Sleep Quality (1-10)", 1, 10, 6, key="sleep_quality")
+    with st.expander("Exercise Metrics"):
+        exercise_hours = st.number_input("Exercise Hours/Week", 0, 168, 5, key="detailed_exercise_hours")
+        exercise_minutes = st.number_input("Exercise Minutes/Week", 0, 59, 0, key="detailed_exercise_minutes")
+        exercise_intensity = st.slider("Intensity (1-10)", 1, 10, 6, key="exercise_intensity")
+    with st.expander("Nutrition Metrics"):
+        calories = st.number_input("Daily Calories", 500, 5000, 2000, key="calories")
+        veggie_servings = st.number_input("Daily Veggie Servings", 0, 10, 3, key="veggies")
+    with st.expander("Health Biomarkers"):
+        systolic_bp = st.number_input("Systolic Blood Pressure", 80, 200, 120, key="bp")
+        cholesterol = st.number_input("Cholesterol (mg/dL)", 100, 300, 180, key="cholesterol")
+    if st.button("Deep Analysis"):
+        sleep = sleep_hours + sleep_minutes / 60
+        exercise = exercise_hours + exercise_minutes / 60
+        bio_age = age + systolic_bp * 0.1 + (cholesterol - 200) * 0.05 - (veggie_servings * 0.2) - (sleep_quality * 0.1) - (exercise_intensity * 0.15)
+        event_log.append("bio_age.detailed", chronological_age=age, bio_age=bio_age, sleep_hours=sleep,
+                         sleep_quality=sleep_quality, exercise_hours=exercise, exercise_intensity=exercise_intensity,
+                         calories=calories, veggie_servings=veggie_servings, systolic_bp=systolic_bp,
+                         cholesterol=cholesterol)
+        st.markdown(f"### Detailed Biological Age: {bio_age:.1f} years")
+        df = pd.DataFrame({"Metric": ["Chronological", "Biological"], "Age": [age, bio_age]})
+        st.bar_chart(df.set_index("Metric"), height=200)
+    st.info("Based on validated biomarkers from UK Biobank")
+st.markdown('</section>', unsafe_allow_html=True)
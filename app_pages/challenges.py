@@ -0,0 +1,35 @@
+# Homo Immortalis - Challenges Page
+# =================================
+# Description: Daily challenges that build a streak toward the next evolution level.
+# Activity is persisted per user as a daily bitmap, so any number of logs on one day
+# count as a single day and the streak survives across sessions.
+# Executed by st.navigation only when this page is open.
+
+import streamlit as st  # Web app framework for UI and interactivity
+
+from common import get_db, get_user_id
+from streaks import get_streak, leaderboard, record_activity
+
+conn = get_db()
+user_id = get_user_id()
+
+st.header("Daily Challenges")
+st.markdown("Complete these to boost your longevity score and evolve!")
+for label, done in [("Log today's healthy meal", "Meal logged!"), ("Log 8+ hours of sleep", "Sleep logged!")]:
+    if st.button(label):
+        streak, counted = record_activity(conn, user_id)
+        suffix = "" if counted else " (today already counts toward your streak)"
+        st.success(f"{done} Current streak: {streak.current} days{suffix}")
+
+streak = get_streak(conn, user_id)
+col_current, col_longest, col_level = st.columns(3)
+col_current.metric("Current Streak", f"{streak.current} days")
+col_longest.metric("Longest Streak", f"{streak.longest} days")
+col_level.metric("Evolution Level", streak.level)
+st.write("Tip: Log daily to unlock higher evolution levels!")
+
+st.subheader("Leaderboard")
+board = leaderboard(conn, limit=10)
+if board:
+    st.table([{"Member": "You" if uid == user_id else uid[:6], "Current": current, "Longest": longest, "Level": level}
+              for uid, current, longest, level in board])
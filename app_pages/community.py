@@ -0,0 +1,79 @@
+# Homo Immortalis - Community Page
+# ================================
+# Description: Share posts, reply to them and browse recent posts (hot table first, archive on demand).
+# Posting is rate limited and switches to read-only while database writes are slow.
+# Executed by st.navigation only when this page is open.
+
+import streamlit as st  # Web app framework for UI and interactivity
+
+from archive import fetch_posts
+from common import get_db, get_event_log, get_post_guard, get_related_index, get_user_id, render_related
+from db import append_reply, insert_post, thread_is_full
+from recommender import post_title
+from throttle import client_address
+
+conn = get_db()
+event_log = get_event_log()
+related_index = get_related_index()
+post_guard = get_post_guard()
+user_id = get_user_id()
+client_ip = client_address(st.context.ip_address, st.context.headers)  # Through trusted proxies only
+
+st.markdown('<section id="community">', unsafe_allow_html=True)
+st.header("Community")
+col_form, col_posts = st.columns([1,2], gap="medium")
+with col_form:
+    st.subheader("Share Your Journey")
+    read_only = post_guard.read_only
+    if read_only:
+        st.info(f"Posting is paused while the community is busy; back in about {int(post_guard.resume_in()) + 1} seconds. "
+                "You can keep reading.")
+    with st.form("post_form"):
+        category = st.selectbox("Topic", ["Sleep", "Exercise", "Nutrition", "Biomarkers"], disabled=read_only)
+        post = st.text_area("What's your experience?", height=200, disabled=read_only)
+        if st.form_submit_button("Post", disabled=read_only):
+            try:
+                # Throttled and de-duplicated in memory before the database is touched
+                post_id = post_guard.submit(user_id, post, lambda text: insert_post(conn, category, text),
+                                             client_ip)
+                related_index.add(f"post:{post_id}", post_title(post), f"{category} {post}")
+                event_log.append("community.post", category=category, content_length=len(post))
+                st.success("Posted!")
+            except ValueError as e:
+                st.error(str(e))
+with col_posts:
+    st.subheader("Recent Posts")
+    if 'posts_page' not in st.session_state:
+        st.session_state.posts_page = 0
+    search = st.text_input("Search posts", key="posts_search")
+    if search != st.session_state.get('posts_last_search', ""):
+        st.session_state.posts_page = 0  # A new search starts from the newest matches
+        st.session_state.posts_last_search = search
+    # Only pages reaching past the hot table query the archive
+    df = fetch_posts(conn, limit=5, offset=st.session_state.posts_page * 5, search=search or None)
+    for _, row in df.iterrows():
+        with st.expander(f"{row['category']} • {row['timestamp']}"):
+            st.html(row['content_html'])  # Pre-rendered safe HTML, no per-rerun markdown parsing
+            render_related(related_index.related(f"post:{row['id']}", k=3))
+            # Replies are appended to the post's text; archived posts are read-only
+            if thread_is_full(row['content']):
+                st.caption("This thread is full.")
+                continue
+            with st.form(key=f"reply_{row['id']}"):
+                reply = st.text_input("Reply", disabled=read_only)
+                if st.form_submit_button("Reply", disabled=read_only):
+                    try:
+                        post_guard.submit(user_id, reply, lambda text: append_reply(
+                            conn, int(row['id']), row['content'], text), client_ip, scope=f"reply:{row['id']}")
+                        event_log.append("community.reply", category=row['category'], content_length=len(reply))
+                        st.success("Replied!")
+                    except ValueError as e:
+                        st.error(str(e))
+    col_newer, col_older = st.columns(2)
+    if col_newer.button("Newer", disabled=st.session_state.posts_page == 0):
+        st.session_state.posts_page -= 1
+        st.rerun()
+    if col_older.button("Older", disabled=len(df) < 5):
+        st.session_state.posts_page += 1
+        st.rerun()
+st.markdown('</section>', unsafe_allow_html=True)
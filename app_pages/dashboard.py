@@ -0,0 +1,74 @@
+# Homo Immortalis - Dashboard Page
+# ================================
+# Description: Progress dashboard toward Homo Immortalis (ported from the old sidebar app).
+# Matplotlib and Seaborn are imported here only, so other pages never load them.
+# Executed by st.navigation only when this page is open.
+
+import logging  # Logging for error handling and debugging
+
+import streamlit as st  # Web app framework for UI and interactivity
+import pandas as pd  # Data manipulation for charts and data handling
+import matplotlib.pyplot as plt  # Charting library for visualizing progress
+import seaborn as sns  # Enhanced charting for beautiful, modern visuals
+
+from common import get_db, get_user_id
+from streaks import get_streak
+
+logger = logging.getLogger(__name__)
+
+
+def configure_charts():
+    """Configure Matplotlib and Seaborn for clean, minimalist charts with high contrast."""
+    try:
+        plt.style.use('dark_background')  # Dark theme for modern look
+        sns.set_palette("husl")  # Husl palette for subtle, non-flashy colors
+        plt.rcParams['figure.facecolor'] = '#001F3F'  # Match app background
+        plt.rcParams['axes.facecolor'] = '#001F3F'  # Axes background
+        plt.rcParams['text.color'] = '#FFFFFF'  # White text for contrast
+        plt.rcParams['axes.labelcolor'] = '#00BFFF'  # Cyan labels for accents
+        plt.rcParams['font.family'] = 'Inter'  # Consistent app font
+        plt.rcParams['axes.grid'] = False  # No grid lines for minimalism
+        plt.rcParams['figure.figsize'] = [8, 4]  # Default figure size
+        plt.rcParams['legend.frameon'] = False  # No legend frame
+        plt.rcParams['legend.fontsize'] = 'small'  # Small legend text
+        plt.rcParams['axes.edgecolor'] = '#FFFFFF'  # White edges for contrast
+        plt.rcParams['xtick.color'] = '#FFFFFF'  # White x-tick labels
+        plt.rcParams['ytick.color'] = '#FFFFFF'  # White y-tick labels
+        plt.rcParams['axes.titlecolor'] = '#00BFFF'  # Cyan titles
+        logger.info("Charts configured successfully.")
+    except Exception as e:
+        logger.error(f"Error configuring charts: {str(e)}")
+        st.error("An error occurred configuring charts. Please try refreshing the page.")
+
+
+configure_charts()
+
+conn = get_db()
+streak = get_streak(conn, get_user_id())
+
+st.header("Your Progress to Homo Immortalis")
+data = st.session_state.get('user_data')
+if not data:
+    st.info("Run a Quick Assessment on the Bio Age page to see your metrics here.")
+else:
+    st.write("### Your Metrics")
+    st.dataframe(pd.DataFrame([data], index=["Current"]))
+    if 'bio_age' in st.session_state:
+        st.metric("Biological Age", f"{st.session_state.bio_age:.1f}",
+                  delta=f"{st.session_state.bio_age - data['age']:.1f} vs. chronological", delta_color="inverse")
+
+    # Simple bar chart for metrics
+    st.write("### Health Metrics Visualization")
+    fig, ax = plt.subplots()
+    metrics = ['Age', 'Sleep (hrs)', 'BMI', 'Exercise (hrs/wk)']
+    values = [data['age'], data['sleep_hours'], data['bmi'], data['exercise_hours']]
+    sns.barplot(x=metrics, y=values, ax=ax)
+    ax.set_ylabel("Value")
+    st.pyplot(fig)
+    plt.close(fig)
+
+# Level progress
+st.write("### Evolution Level")
+st.write(f"Current Level: {streak.level} ({streak.current}-day streak, longest {streak.longest})")
+if streak.level != "Homo Sapiens":
+    st.markdown(f"🚀 You've evolved to {streak.level}! Keep optimizing to reach Homo Immortalis.")
@@ -0,0 +1,98 @@
+# Homo Immortalis - Personal Notebook Page
+# ========================================
+# Description: Progress log, wearable data imports and reminders.
+# Executed by st.navigation only when this page is open.
+
+import logging  # Logging for error handling and debugging
+from datetime import datetime  # Timestamp handling for entries and reminders
+
+import streamlit as st  # Web app framework for UI and interactivity
+
+from common import get_db, get_reminders, get_user_id
+from db import connect
+from wearables import daily_metrics, import_file
+
+logger = logging.getLogger(__name__)
+
+conn = get_db()
+reminders = get_reminders()
+user_id = get_user_id()
+
+st.markdown('<section id="notebook">', unsafe_allow_html=True)
+st.header("Personal Notebook")
+if 'entries' not in st.session_state:
+    st.session_state.entries = []
+col_note, col_list = st.columns([1,2], gap="medium")
+with col_note:
+    with st.form("notebook_form"):
+        entry = st.text_area("Log your progress, biomarkers, thoughts...", height=200)
+        if st.form_submit_button("Save Entry"):
+            st.session_state.entries.append({
+                "time": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                "content": entry
+            })
+            st.success("Saved!")
+with col_list:
+    if st.session_state.entries:
+        for entry in st.session_state.entries[-5:]:
+            with st.container():
+                st.subheader(entry["time"])
+                st.write(entry["content"])
+    else:
+        st.info("Start logging your journey!")
+
+# Wearable Imports - streamed into the biomarker store with bounded memory
+st.subheader("Wearable Data")
+with st.expander("Import Apple Health, Oura or Garmin exports"):
+    upload = st.file_uploader("Apple Health export.zip/export.xml, Oura or Garmin CSV",
+                              type=["zip", "xml", "csv"], key="wearable_upload")
+    if upload is not None and st.button("Import"):
+        progress_bar = st.progress(0.0, text="Importing...")
+        import_conn = connect()  # Its own connection: the import stages into a per-connection TEMP table
+        try:
+            count = import_file(import_conn, user_id, upload, upload.name,
+                                progress=lambda fraction: progress_bar.progress(fraction, text="Importing..."),
+                                total_bytes=upload.size)
+            progress_bar.progress(1.0, text="Done")
+            st.success(f"Imported {count:,} records.")
+        except Exception as e:
+            logger.error(f"Error importing wearable data: {str(e)}")
+            st.error(f"Could not import this file: {str(e)}")
+        finally:
+            import_conn.close()
+metrics = daily_metrics(conn, user_id, ["sleep_hours", "exercise_minutes"])
+if not metrics.empty:
+    st.line_chart(metrics.tail(90), height=200)
+
+# Reminders - due notifications come from the scheduler's per-user inbox, no scanning here
+st.subheader("Reminders")
+due = reminders.notifications(user_id)
+for _, message, fired_at in due:
+    st.info(f"⏰ {message} ({datetime.fromtimestamp(fired_at).strftime('%Y-%m-%d %H:%M')})")
+if due and st.button("Dismiss reminders"):
+    reminders.acknowledge(user_id, [notification_id for notification_id, _, _ in due])
+    st.rerun()
+col_reminder, col_upcoming = st.columns([1,2], gap="medium")
+with col_reminder:
+    with st.form("reminder_form"):
+        message = st.text_input("Remind me to...")
+        remind_date = st.date_input("Date", key="reminder_date")
+        remind_time = st.time_input("Time", key="reminder_time")
+        repeat = st.selectbox("Repeat", ["Never", "Hourly", "Daily", "Weekly"])
+        if st.form_submit_button("Add Reminder"):
+            if not message.strip():
+                st.error("Reminder message cannot be empty.")
+            else:
+                fire_at = datetime.combine(remind_date, remind_time).timestamp()
+                rule = None if repeat == "Never" else repeat.lower()
+                reminders.add(user_id, message.strip(), fire_at, rule)
+                st.success("Reminder set!")
+with col_upcoming:
+    for reminder_id, message, next_fire, rule in reminders.upcoming(user_id):
+        col_text, col_cancel = st.columns([4,1])
+        col_text.write(f"{datetime.fromtimestamp(next_fire).strftime('%Y-%m-%d %H:%M')} • {message}"
+                       + (f" ({rule})" if rule else ""))
+        if col_cancel.button("Cancel", key=f"cancel_reminder_{reminder_id}"):
+            reminders.cancel(reminder_id, user_id)
+            st.rerun()
+st.markdown('</section>', unsafe_allow_html=True)
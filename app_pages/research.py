@@ -0,0 +1,32 @@
+# Homo Immortalis - Scientific News Page
+# ======================================
+# Description: Latest PubMed longevity research, fetched off the script thread.
+# Executed by st.navigation only when this page is open.
+
+import streamlit as st  # Web app framework for UI and interactivity
+
+from common import get_news_fetcher, get_related_index, render_related
+
+news_fetcher = get_news_fetcher()
+related_index = get_related_index()
+
+st.markdown('<section id="news">', unsafe_allow_html=True)
+st.header("Latest Research")
+# The fetch runs off the script thread; the render waits at most two seconds for it
+entries, fresh = news_fetcher.get(deadline=2.0)
+if not entries:
+    st.info("Latest research is loading — check back in a moment.")
+elif not fresh:
+    st.caption("Showing previously fetched studies while PubMed is slow or unavailable.")
+cols = st.columns(3, gap="medium")
+for i, entry in enumerate(entries[:9]):
+    with cols[i % 3]:
+        with st.container():
+            st.markdown(f"**{entry['title']}**")
+            st.caption(entry['published'])
+            st.link_button("Read Study", entry['link'], use_container_width=True)
+            key = f"news:{entry['link']}"
+            if key not in related_index:
+                related_index.add(key, entry['title'], entry.get('summary', ""))
+            render_related(related_index.related(key, k=3, prefix="post:"))
+st.markdown('</section>', unsafe_allow_html=True)
@@ -0,0 +1,133 @@
+# Homo Immortalis - Posts Archive
+# ===============================
+# Description: Hot/cold archiving for the community `posts` table.
+# Posts older than a configurable age are moved from community.db into an attached
+# archive database, so the hot table, its pages and its indexes stay small and
+# cache-resident. Reads go to the hot table first and only touch the archive when a
+# user pages or searches back past the hot rows.
+# Usage (cron or manual): python archive.py --max-age-days 90
+
+import argparse  # Command-line interface for the archiving job
+import logging  # Logging for error handling and debugging
+import os  # Environment configuration
+import threading  # Background archiving thread
+from datetime import datetime, timedelta  # Age cutoff computation
+
+import pandas as pd  # Query results as DataFrames, matching the app's read path
+
+from db import DB_PATH, POSTS_COLUMNS, connect, create_posts_table
+from rendering import rerender_stale
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PATH = os.environ.get("IMMORTALIS_ARCHIVE_PATH", "community_archive.db")
+ARCHIVE_SCHEMA = "archive"
+DEFAULT_MAX_AGE_DAYS = int(os.environ.get("IMMORTALIS_ARCHIVE_MAX_AGE_DAYS", "90"))
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"  # Same format the Post form writes
+
+_attach_lock = threading.Lock()
+
+
+# =======================
+# Archive Attachment
+# =======================
+def attach_archive(conn, path=ARCHIVE_PATH):
+    """Attach the archive database to `conn` (once) and make sure its posts table exists."""
+    with _attach_lock:
+        attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+        if ARCHIVE_SCHEMA not in attached:
+            conn.commit()  # ATTACH is not allowed inside an open transaction
+            conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+            create_posts_table(conn, ARCHIVE_SCHEMA)
+            logger.info(f"Attached posts archive {path}.")
+
+
+def archive_exists(path=ARCHIVE_PATH):
+    """True if an archive database has been created, i.e. there is anything to fall back to."""
+    return os.path.exists(path)
+
+
+# =======================
+# Archiving Job
+# =======================
+def archive_old_posts(conn, max_age_days=DEFAULT_MAX_AGE_DAYS, batch_size=5000, archive_path=ARCHIVE_PATH):
+    """Move posts older than `max_age_days` into the archive in short batches; returns rows moved.
+
+    Each batch is copied and deleted in one transaction, so a post is always in exactly
+    one of the two tables, and writers are only blocked for the duration of one batch.
+    """
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime(TIMESTAMP_FORMAT)
+    columns = ", ".join(POSTS_COLUMNS)
+    # The newest post always stays hot so its rowid keeps new ids above every archived id
+    batch = ("SELECT id FROM main.posts WHERE timestamp < ? AND id < (SELECT MAX(id) FROM main.posts) "
+             "ORDER BY timestamp, id LIMIT ?")
+    if conn.execute("SELECT 1 FROM main.posts WHERE timestamp < ? LIMIT 1", (cutoff,)).fetchone() is None:
+        return 0
+    attach_archive(conn, archive_path)
+    moved = 0
+    while True:
+        with conn:
+            conn.execute(f"INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.posts ({columns}) "
+                         f"SELECT {columns} FROM main.posts WHERE id IN ({batch})", (cutoff, batch_size))
+            count = conn.execute(f"DELETE FROM main.posts WHERE id IN ({batch})", (cutoff, batch_size)).rowcount
+        moved += count
+        if count < batch_size:
+            break
+    logger.info(f"Archived {moved} posts older than {cutoff}.")
+    return moved
+
+
+def start_archiver(path=DB_PATH, interval_hours=24.0, max_age_days=DEFAULT_MAX_AGE_DAYS):
+    """Run the archiving job on its own connection every `interval_hours` in a daemon thread."""
+    stop = threading.Event()
+
+    def run():
+        conn = connect(path)
+        while True:
+            try:
+                archive_old_posts(conn, max_age_days)
+            except Exception as e:
+                logger.error(f"Error archiving posts: {str(e)}")
+            if stop.wait(interval_hours * 3600):
+                break
+        conn.close()
+
+    threading.Thread(target=run, name="posts-archiver", daemon=True).start()
+    return stop
+
+
+# =======================
+# Read Path
+# =======================
+def fetch_posts(conn, limit=5, offset=0, search=None, archive_path=ARCHIVE_PATH):
+    """Return one page of posts, newest first, spanning the hot table and the archive.
+
+    The archive is attached and queried only when the requested page extends past
+    the posts still in the hot table.
+    """
+    where, params = "", []
+    if search:
+        where, params = "WHERE content LIKE ? OR category LIKE ?", [f"%{search}%"] * 2
+    query = f"SELECT * FROM {{schema}}.posts {where} ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?"
+    hot = rerender_stale(conn, pd.read_sql(query.format(schema="main"), conn, params=params + [limit, offset]))
+    if len(hot) == limit or not archive_exists(archive_path):
+        return hot
+    # The page runs past the hot rows: continue into the archive where the hot table ends
+    hot_total = conn.execute(f"SELECT COUNT(*) FROM main.posts {where}", params).fetchone()[0]
+    attach_archive(conn, archive_path)
+    cold = pd.read_sql(query.format(schema=ARCHIVE_SCHEMA), conn,
+                       params=params + [limit - len(hot), max(offset - hot_total, 0)])
+    cold = rerender_stale(conn, cold, ARCHIVE_SCHEMA)
+    if hot.empty:
+        return cold
+    return pd.concat([hot, cold], ignore_index=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Move old community posts into the archive database.")
+    parser.add_argument("--db", default=DB_PATH, help="Path to community.db")
+    parser.add_argument("--archive", default=ARCHIVE_PATH, help="Path to the archive database")
+    parser.add_argument("--max-age-days", type=int, default=DEFAULT_MAX_AGE_DAYS, help="Archive posts older than this")
+    args = parser.parse_args()
+    archive_old_posts(connect(args.db), args.max_age_days, archive_path=args.archive)
@@ -0,0 +1,149 @@
+# Homo Immortalis - Online Backups
+# ================================
+# Description: Consistent snapshots of community.db (and the posts archive) taken with
+# SQLite's online backup API while the app keeps running.
+# Pages are copied a few hundred at a time, sleeping between steps (in the progress
+# callback: the backup API itself only sleeps after a step finds the database busy), so
+# each step holds the source's read lock briefly and the copy does not saturate the disk.
+# If the source keeps changing under the copy (each write by another connection restarts
+# it), the backup falls back to a single-pass copy, which in WAL mode only holds a read
+# snapshot and never blocks writers.
+# Each copy is checked with PRAGMA integrity_check before it replaces the partial file,
+# and only the newest `keep` snapshots per database are retained. Every worker starts the
+# scheduled job, but a shared-cache lease lets only one process take each day's snapshot.
+# Usage (cron or manual): python backup.py [--dest backups] [--keep 7]
+#                         python backup.py list
+
+import argparse  # Command-line interface
+import logging  # Logging for error handling and debugging
+import os  # Snapshot files and rotation
+import sqlite3  # Online backup API
+import time  # Step pauses and timing
+from datetime import datetime  # Snapshot names
+
+from archive import ARCHIVE_PATH, archive_exists
+from db import DB_PATH
+from shared_cache import run_periodic
+
+logger = logging.getLogger(__name__)
+
+BACKUP_DIR = os.environ.get("IMMORTALIS_BACKUP_DIR", "backups")
+BACKUP_KEEP = int(os.environ.get("IMMORTALIS_BACKUP_KEEP", "7"))
+STEP_PAGES = 256  # 1 MB per step at the default 4 KB page size
+STEP_SLEEP = 0.05  # Seconds slept after each step that leaves pages to copy
+MAX_RESTARTS = 5
+SNAPSHOT_SUFFIX = ".db"
+
+
+class BackupError(Exception):
+    """Raised when a snapshot cannot be taken or fails its integrity check."""
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def _snapshot_name(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}-{datetime.now().strftime('%Y%m%d-%H%M%S')}{SNAPSHOT_SUFFIX}"
+
+
+def list_snapshots(path=DB_PATH, dest=BACKUP_DIR):
+    """Snapshots of one database in `dest`, newest first."""
+    stem = os.path.splitext(os.path.basename(path))[0] + "-"
+    if not os.path.isdir(dest):
+        return []
+    names = [n for n in os.listdir(dest) if n.startswith(stem) and n.endswith(SNAPSHOT_SUFFIX)
+             and n[len(stem):-len(SNAPSHOT_SUFFIX)].replace("-", "").isdigit()]
+    return [os.path.join(dest, n) for n in sorted(names, reverse=True)]
+
+
+def rotate(path=DB_PATH, dest=BACKUP_DIR, keep=BACKUP_KEEP):
+    """Delete all but the newest `keep` snapshots of a database; returns the deleted paths."""
+    stale = list_snapshots(path, dest)[keep:]
+    for snapshot in stale:
+        os.remove(snapshot)
+    return stale
+
+
+# =======================
+# Taking Snapshots
+# =======================
+def _copy(source, target, pages, sleep):
+    """Stepped backup pausing `sleep` seconds between steps; gives up after MAX_RESTARTS source modifications."""
+    state = {"remaining": None, "restarts": 0}
+
+    def progress(status, remaining, total):
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1  # Another connection wrote to the source; the copy started over
+            if state["restarts"] > MAX_RESTARTS:
+                raise _TooManyRestarts()
+        state["remaining"] = remaining
+        if remaining > 0:
+            time.sleep(sleep)  # Connection.backup's own `sleep` only applies after BUSY/LOCKED steps
+
+    source.backup(target, pages=pages, progress=progress, sleep=sleep)
+
+
+def backup_database(path=DB_PATH, dest=BACKUP_DIR, keep=BACKUP_KEEP, pages=STEP_PAGES, sleep=STEP_SLEEP):
+    """Take a verified snapshot of the database at `path`; returns the snapshot path."""
+    os.makedirs(dest, exist_ok=True)
+    final = os.path.join(dest, _snapshot_name(path))
+    partial = final + ".partial"
+    start = time.perf_counter()
+    source = sqlite3.connect(path, timeout=30.0)
+    target = sqlite3.connect(partial)
+    try:
+        try:
+            _copy(source, target, pages, sleep)
+        except (_TooManyRestarts, sqlite3.OperationalError) as e:
+            logger.warning(f"Stepped backup of {path} did not settle ({type(e).__name__}); copying in one pass.")
+            source.backup(target)
+        target.execute("PRAGMA journal_mode = DELETE")  # A snapshot is a single self-contained file
+        result = target.execute("PRAGMA integrity_check").fetchall()
+        if result != [("ok",)]:
+            raise BackupError(f"Snapshot of {path} failed its integrity check: {result[:5]}")
+    except Exception:
+        target.close()
+        os.remove(partial)
+        raise
+    finally:
+        source.close()
+    target.close()
+    os.replace(partial, final)
+    removed = rotate(path, dest, keep)
+    logger.info(f"Backed up {path} to {final} in {time.perf_counter() - start:.1f}s "
+                f"({os.path.getsize(final) / 1e6:.1f} MB); removed {len(removed)} old snapshot(s).")
+    return final
+
+
+def backup_all(dest=BACKUP_DIR, keep=BACKUP_KEEP, path=DB_PATH, archive_path=ARCHIVE_PATH):
+    """Snapshot community.db and, if present, the posts archive; returns the snapshot paths."""
+    snapshots = [backup_database(path, dest, keep)]
+    if archive_exists(archive_path):
+        snapshots.append(backup_database(archive_path, dest, keep))
+    return snapshots
+
+
+def start_backups(interval_hours=24.0, dest=BACKUP_DIR, keep=BACKUP_KEEP, check_seconds=300.0):
+    """Take snapshots about every `interval_hours` from one worker at a time; returns a stop Event."""
+    # The lease outlasts a slow multi-GB copy, so a second worker never starts a snapshot alongside it
+    return run_periodic("db-backups", interval_hours * 3600, lambda: backup_all(dest, keep),
+                        check_seconds=check_seconds, lease_seconds=6 * 3600.0)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Take or list online backups of community.db.")
+    parser.add_argument("command", nargs="?", choices=["backup", "list"], default="backup")
+    parser.add_argument("--db", default=DB_PATH, help="Path to community.db")
+    parser.add_argument("--archive", default=ARCHIVE_PATH, help="Path to the archive database")
+    parser.add_argument("--dest", default=BACKUP_DIR, help="Snapshot directory")
+    parser.add_argument("--keep", type=int, default=BACKUP_KEEP, help="Snapshots to retain per database")
+    args = parser.parse_args()
+    if args.command == "list":
+        for db_path in (args.db, args.archive):
+            for snapshot in list_snapshots(db_path, args.dest):
+                print(f"{snapshot}  {os.path.getsize(snapshot) / 1e6:.1f} MB")
+    else:
+        backup_all(args.dest, args.keep, args.db, args.archive)
@@ -0,0 +1,189 @@
+# Homo Immortalis - Bulk Post Ingestion
+# =====================================
+# Description: Loads posts exported from another forum into the Community section.
+# Records are read from JSON Lines or CSV (fields: content, category, optional timestamp),
+# validated and rendered exactly like posts from the Post form, and inserted with
+# executemany in large transactions; the related-content index is rebuilt once at the end.
+# Invalid records are skipped and reported with their line numbers.
+# With --defer-indexes the secondary indexes on `posts` are dropped for the load and
+# recreated from their original DDL afterwards, which is much cheaper than updating them
+# row by row. The whole load then runs as one transaction holding the write lock: readers
+# keep seeing the last committed posts table, indexes included, but app writes wait or
+# fail (posting pauses) until it commits, so use it in a maintenance window.
+# Usage: python bulk_ingest.py forum_export.jsonl [--format csv] [--rejects rejects.jsonl] [--defer-indexes]
+
+import argparse  # Command-line interface
+import csv  # CSV exports
+import io  # Text wrappers for binary uploads
+import json  # JSON Lines exports and reject reports
+import logging  # Logging for error handling and debugging
+import time  # Throughput reporting
+from datetime import datetime  # Timestamp normalization
+
+from archive import TIMESTAMP_FORMAT
+from db import DB_PATH, connect
+from rendering import prepare_post, validate_post
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50000  # Rows per transaction
+MAX_CATEGORY_LENGTH = 50
+# Accepted timestamp layouts, normalized to the Post form's TIMESTAMP_FORMAT
+TIMESTAMP_LAYOUTS = ["%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"]
+
+
+def _timestamp(value, default):
+    """Normalize a timestamp string (or Unix seconds) to TIMESTAMP_FORMAT."""
+    if value in (None, ""):
+        return default
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value).strftime(TIMESTAMP_FORMAT)
+    text = str(value).strip()
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    else:
+        # Posts store naive server-local times; convert zoned timestamps instead of dropping the offset
+        return (parsed.astimezone() if parsed.tzinfo else parsed).strftime(TIMESTAMP_FORMAT)
+    for layout in TIMESTAMP_LAYOUTS:
+        try:
+            return datetime.strptime(text, layout).strftime(TIMESTAMP_FORMAT)
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized timestamp: {text[:40]}")
+
+
+def read_records(fileobj, fmt):
+    """Yield (line_number, record dict) from a JSON Lines or CSV text stream."""
+    if fmt == "csv":
+        reader = csv.DictReader(fileobj)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(fileobj, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ValueError(f"Invalid JSON: {str(e)}")
+            continue
+        yield line_number, record if isinstance(record, dict) else ValueError("Expected a JSON object")
+
+
+def _row(record, render, now):
+    """Validate one record into a posts row; raises ValueError for invalid records."""
+    if isinstance(record, ValueError):
+        raise record
+    category = str(record.get("category") or "").strip()
+    if not category or len(category) > MAX_CATEGORY_LENGTH:
+        raise ValueError("Missing or overlong category.")
+    timestamp = _timestamp(record.get("timestamp"), now)
+    if render:
+        clean, content_html, version = prepare_post(record.get("content"))
+    else:
+        # Stored unrendered; the read path renders each post once on first view
+        clean, content_html, version = validate_post(record.get("content")), None, None
+    return category, clean, timestamp, content_html, version
+
+
+# =======================
+# Index Deferral
+# =======================
+def _drop_post_indexes(conn):
+    """Drop the secondary indexes on main.posts inside the open transaction; returns their DDL."""
+    indexes = conn.execute("SELECT name, sql FROM main.sqlite_master "
+                           "WHERE type = 'index' AND tbl_name = 'posts' AND sql IS NOT NULL").fetchall()
+    for name, _ in indexes:
+        conn.execute(f"DROP INDEX main.{name}")
+    return [sql for _, sql in indexes]
+
+
+def _recreate_indexes(conn, ddl):
+    for sql in ddl:
+        conn.execute(sql)
+
+
+def ingest_posts(conn, fileobj, fmt="jsonl", batch_size=BATCH_SIZE, defer_indexes=False, render=True,
+                 rebuild_related=True, progress=None):
+    """Load posts from a JSON Lines/CSV stream; returns (inserted, rejects).
+
+    `rejects` lists (line_number, reason). Batches are committed as they go, and kept
+    if the load fails part-way. With `defer_indexes` the load is a single transaction
+    under the write lock instead: indexes are dropped and recreated inside it, so no
+    other connection ever sees the table without them, and a failure inserts nothing.
+    """
+    if isinstance(fileobj, io.BufferedIOBase) or hasattr(fileobj, "mode") and "b" in fileobj.mode:
+        fileobj = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    now = datetime.now().strftime(TIMESTAMP_FORMAT)
+    inserted, rejects, batch = 0, [], []
+    start = time.perf_counter()
+    ddl = []
+    if defer_indexes:
+        conn.commit()
+        conn.execute("BEGIN IMMEDIATE")  # Held until the indexes are back; other writers wait
+        ddl = _drop_post_indexes(conn)
+
+    def flush():
+        nonlocal inserted, batch
+        conn.executemany("INSERT INTO posts (category, content, timestamp, content_html, render_version) "
+                         "VALUES (?, ?, ?, ?, ?)", batch)
+        if not defer_indexes:
+            conn.commit()
+        inserted += len(batch)
+        batch = []
+        if progress:
+            progress(inserted)
+
+    try:
+        for line_number, record in read_records(fileobj, fmt):
+            try:
+                batch.append(_row(record, render, now))
+            except ValueError as e:
+                rejects.append((line_number, str(e)))
+                continue
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        if ddl:
+            index_start = time.perf_counter()
+            _recreate_indexes(conn, ddl)
+            logger.info(f"Recreated {len(ddl)} posts index(es) in {time.perf_counter() - index_start:.1f}s.")
+        conn.commit()
+    except BaseException:
+        conn.rollback()  # Also restores dropped indexes; with deferral nothing was inserted
+        raise
+    logger.info(f"Ingested {inserted} posts ({len(rejects)} rejected) in {time.perf_counter() - start:.1f}s.")
+    if rebuild_related and inserted:
+        from recommender import rebuild
+        rebuild(conn)  # New posts only reach the related-content vocabulary through a rebuild
+    return inserted, rejects
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Bulk-load posts from a JSON Lines or CSV export.")
+    parser.add_argument("path", help="JSON Lines (.jsonl) or CSV export with content, category and timestamp fields")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from the file extension)")
+    parser.add_argument("--db", default=DB_PATH, help="Path to community.db")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per transaction")
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="Drop indexes for the load and rebuild them after; blocks app writes until done")
+    parser.add_argument("--defer-render", action="store_true", help="Render posts on first view instead of now")
+    parser.add_argument("--skip-related", action="store_true", help="Do not rebuild the related-content index")
+    parser.add_argument("--rejects", help="Write rejected records' line numbers and reasons to this JSON Lines file")
+    args = parser.parse_args()
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+    with open(args.path, encoding="utf-8", newline="") as f:
+        count, rejected = ingest_posts(connect(args.db), f, fmt, args.batch_size, args.defer_indexes,
+                                       not args.defer_render, not args.skip_related,
+                                       progress=lambda n: print(f"\rInserted {n} posts...", end="", flush=True))
+    print(f"\nInserted {count} posts, rejected {len(rejected)}.")
+    for line_number, reason in rejected[:10]:
+        print(f"  line {line_number}: {reason}")
+    if args.rejects:
+        with open(args.rejects, "w") as f:
+            for line_number, reason in rejected:
+                f.write(json.dumps({"line": line_number, "reason": reason}) + "\n")
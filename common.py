@@ -0,0 +1,134 @@
+# Homo Immortalis - Shared Page Resources
+# =======================================
+# Description: Process-wide resources and helpers used by the pages in app_pages/.
+# Every resource is created on first use by the page that needs it and then cached
+# with st.cache_resource; imports happen inside the functions, so a page only pays
+# for the libraries it actually uses (e.g. pyarrow is loaded only by pages that log
+# analytics, requests/feedparser only by the News page).
+
+import hashlib  # Anonymous user ids
+import html  # Escaping user text in related-content lists
+import logging  # Logging for error handling and debugging
+import os  # Random bytes for new user ids
+import re  # User id validation
+
+import streamlit as st  # Web app framework for UI and interactivity
+
+logger = logging.getLogger(__name__)
+
+
+# =======================
+# Shared Resources
+# =======================
+@st.cache_resource
+def get_db():
+    """Open community.db once per process and start its archiver, maintenance and backup threads."""
+    from db import connect
+    from archive import start_archiver
+    from wearables import create_biomarker_table
+    from streaks import create_streak_tables
+    from maintenance import start_maintenance
+    from backup import start_backups
+    conn = connect()
+    create_biomarker_table(conn)
+    create_streak_tables(conn)
+    start_archiver()  # Keep the hot posts table small by moving old posts to the archive daily
+    start_maintenance()  # Daily ANALYZE/optimize and incremental vacuum at a quiet moment, one worker at a time
+    start_backups()  # Daily verified online snapshots, rotated, taken by one worker
+    return conn
+
+
+@st.cache_resource
+def get_event_log():
+    """Create the process-wide analytics event log, kept apart from community.db."""
+    from event_log import EventLog
+    return EventLog()
+
+
+@st.cache_resource
+def get_reminders():
+    """Start this process's reminder scheduler thread; workers claim reminder rows, so each fires once."""
+    from reminders import ReminderScheduler
+    return ReminderScheduler()
+
+
+@st.cache_resource
+def get_news_fetcher():
+    """Create the fetcher shared by all sessions, so its cache and circuit breaker are too."""
+    from news import NewsFetcher
+    from shared_cache import get_shared_cache
+    return NewsFetcher(shared=get_shared_cache())
+
+
+@st.cache_resource
+def get_post_guard():
+    """Create the process-wide post rate limiter and read-only switch."""
+    from throttle import PostGuard
+    return PostGuard()
+
+
+@st.cache_resource
+def get_related_index():
+    """Map the related-content index, building it from community.db on first run."""
+    from recommender import RelatedIndex, rebuild, start_rebuilder
+    index = RelatedIndex()
+    if not index.ready:
+        rebuild(get_db(), wait=True)  # Or wait for the worker that is already building it
+        index = RelatedIndex()
+    start_rebuilder()  # Periodically fold new posts and articles into the base index
+    return index
+
+
+def render_related(related):
+    """Render a "Related" list from RelatedIndex results; articles link out, posts show their snippet.
+
+    Titles are user or feed text, so they are HTML-escaped and never parsed as markdown.
+    """
+    if not related:
+        return
+    items = []
+    for key, title, _ in related:
+        url = key[len("news:"):] if key.startswith("news:") else None
+        if url and url.startswith(("https://", "http://")):
+            items.append(f'<li>📄 <a href="{html.escape(url)}" target="_blank" rel="nofollow noopener noreferrer">'
+                         f'{html.escape(title)}</a></li>')
+        else:
+            items.append(f"<li>{'📄' if url else '💬'} {html.escape(title)}</li>")
+    st.caption("Related")
+    st.html(f"<ul>{''.join(items)}</ul>")
+
+
+@st.cache_resource
+def get_session_memory():
+    """Create the session-state registry and start its idle-eviction sweeper."""
+    from session_memory import SessionMemory
+    memory = SessionMemory()
+    memory.start_sweeper()
+    return memory
+
+
+def track_session():
+    """Register this run's session for memory accounting and restore its evicted state."""
+    from maintenance import note_activity
+    get_session_memory().track(st.session_state.get('user_id'))
+    note_activity()  # Background maintenance waits for all workers to be quiet
+
+
+def finish_session_run():
+    """Mark this session's run finished, so it only becomes evictable once idle from here."""
+    get_session_memory().finish()
+
+
+# =======================
+# Anonymous User Identity
+# =======================
+def get_user_id():
+    """Return a stable anonymous user id, kept in the URL so it survives reloads and restarts."""
+    if 'user_id' not in st.session_state:
+        uid = st.query_params.get("uid")
+        if not uid or not re.fullmatch(r"[0-9a-f]{16}", uid):
+            uid = hashlib.sha256(os.urandom(32)).hexdigest()[:16]
+        st.session_state.user_id = uid
+    if st.query_params.get("uid") != st.session_state.user_id:
+        st.query_params["uid"] = st.session_state.user_id  # Page switches drop query parameters
+    return st.session_state.user_id
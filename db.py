@@ -0,0 +1,116 @@
+# Homo Immortalis - Database Helpers
+# ==================================
+# Description: Shared SQLite schema and post-writing helpers for community.db and its attached databases.
+# Keeping the DDL in one place lets the hot `posts` table and the archive copy stay identical.
+
+import logging  # Logging for error handling and debugging
+import os  # Pragma overrides from the environment
+import sqlite3  # Database for persistent storage of posts
+from datetime import datetime  # Post timestamps
+
+from query_trace import TRACE_ENABLED, TracingConnection
+from rendering import MAX_POST_LENGTH, prepare_post
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = 'community.db'
+POSTS_COLUMNS = ["id", "category", "content", "timestamp", "content_html", "render_version"]
+# Columns added after the original schema, applied to existing databases on startup
+POSTS_MIGRATIONS = {"content_html": "TEXT", "render_version": "INTEGER"}
+
+# Connection settings applied to every community.db connection; each can be overridden
+# with IMMORTALIS_SQLITE_<NAME>, e.g. IMMORTALIS_SQLITE_MMAP_SIZE=0 to turn off mmap.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",  # Readers no longer block on the writer (persistent, set once per file)
+    "synchronous": "NORMAL",  # Durable across application crashes; fsync only at WAL checkpoints
+    "busy_timeout": 5000,  # Wait up to 5 s for the write lock instead of failing immediately
+    "cache_size": -32000,  # 32 MB page cache per connection (negative values are KiB)
+    "mmap_size": 268435456,  # Read pages through a 256 MB memory map instead of read() calls
+    "temp_store": "MEMORY",  # Sorts and temp indexes in memory
+    "analysis_limit": 1000,  # Bound the rows ANALYZE / PRAGMA optimize sample per index
+}
+DB_PRAGMAS = {name: os.environ.get(f"IMMORTALIS_SQLITE_{name.upper()}", value) for name, value in DEFAULT_PRAGMAS.items()}
+
+
+def create_posts_table(conn, schema="main"):
+    """Create the posts table (and its timestamp index) in the given schema if missing."""
+    conn.execute(f'''CREATE TABLE IF NOT EXISTS {schema}.posts
+                    (id INTEGER PRIMARY KEY, category TEXT, content TEXT, timestamp TEXT,
+                     content_html TEXT, render_version INTEGER)''')
+    existing = {row[1] for row in conn.execute(f"PRAGMA {schema}.table_info(posts)")}
+    for column, column_type in POSTS_MIGRATIONS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {schema}.posts ADD COLUMN {column} {column_type}")
+            logger.info(f"Added column {column} to {schema}.posts.")
+    # "Recent Posts" orders by timestamp; the index turns that into a short index walk
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_posts_timestamp ON posts (timestamp)")
+    conn.commit()
+
+
+def apply_pragmas(conn, pragmas=None):
+    """Apply DB_PRAGMAS (plus any overrides) to a freshly opened connection."""
+    for name, value in {**DB_PRAGMAS, **(pragmas or {})}.items():
+        try:
+            conn.execute(f"PRAGMA {name} = {value}")
+        except sqlite3.OperationalError as e:
+            logger.error(f"Error applying PRAGMA {name}: {str(e)}")  # e.g. journal_mode while another process writes
+
+
+def connect(path=DB_PATH, pragmas=None):
+    """Open a connection to community.db usable from Streamlit's worker threads.
+
+    Statements are timed and slow ones logged with their query plans (see query_trace).
+    """
+    factory = TracingConnection if TRACE_ENABLED else sqlite3.Connection
+    conn = sqlite3.connect(path, check_same_thread=False, factory=factory)
+    apply_pragmas(conn, pragmas)
+    create_posts_table(conn)
+    return conn
+
+
+def insert_post(conn, category, content, timestamp=None):
+    """Validate, render and store a new post; raises ValueError for invalid content."""
+    clean, content_html, version = prepare_post(content)
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M")
+    with conn:
+        cursor = conn.execute("INSERT INTO posts (category, content, timestamp, content_html, render_version) "
+                              "VALUES (?, ?, ?, ?, ?)", (category, clean, timestamp, content_html, version))
+    return cursor.lastrowid
+
+
+def update_post_content(conn, post_id, content, previous=None):
+    """Replace a post's text and re-render its stored HTML; raises ValueError if it cannot be updated.
+
+    With `previous`, the update only applies while the stored text is still `previous`,
+    so two edits made from the same snapshot cannot overwrite each other.
+    """
+    clean, content_html, version = prepare_post(content)
+    query = "UPDATE main.posts SET content = ?, content_html = ?, render_version = ? WHERE id = ?"
+    params = [clean, content_html, version, post_id]
+    if previous is not None:
+        query += " AND content = ?"
+        params.append(previous)
+    with conn:
+        updated = conn.execute(query, params).rowcount
+    if not updated:  # Archived posts are read-only, and a concurrent edit means re-reading first
+        raise ValueError("This post was archived or changed in the meantime; reload the page and try again.")
+
+
+REPLY_SEPARATOR = "\nReply: "
+
+
+def thread_is_full(content):
+    """True if not even a one-character reply fits within the post length limit."""
+    return len(content) + len(REPLY_SEPARATOR) + 1 > MAX_POST_LENGTH
+
+
+def append_reply(conn, post_id, content, reply):
+    """Append a reply to a post whose stored text was `content`; raises ValueError if it does not fit or changed."""
+    text = f"{content}{REPLY_SEPARATOR}{reply}"
+    if len(text) > MAX_POST_LENGTH:
+        room = MAX_POST_LENGTH - len(content) - len(REPLY_SEPARATOR)
+        if room <= 0:
+            raise ValueError("This thread is full. Start a new post to continue the conversation.")
+        raise ValueError(f"This thread only has room for {room} more characters; shorten your reply "
+                         "or start a new post.")
+    update_post_content(conn, post_id, text, previous=content)
@@ -0,0 +1,238 @@
+# Homo Immortalis - Analytics Event Log
+# =====================================
+# Description: Append-only, date-partitioned Parquet log of anonymized app events.
+# Every bio-age calculation and community event is buffered in memory and written
+# to a Hive-style dataset (events/date=YYYY-MM-DD/*.parquet) with pyarrow, fully
+# decoupled from community.db so analytics never compete with user traffic.
+# Key Features:
+# - Buffered writes: events are flushed in batches (by count or age), one file per date partition,
+#   by the background thread, so a page render never waits on disk I/O or compaction.
+# - Periodic compaction: small files in a partition are merged into a single file. Every
+#   worker process compacts, so each partition is compacted under a shared-cache lease.
+# - Range reader: scans a date range with column projection and predicate pushdown.
+# - Anonymized: no free text or user identifiers are stored, only categories and numbers.
+
+import atexit  # Flush buffered events on interpreter shutdown
+import logging  # Logging for error handling and debugging
+import os  # OS utilities for partition directories and atomic renames
+import threading  # Background flush/compaction thread and buffer lock
+import time  # Monotonic timers for flush and compaction intervals
+import uuid  # Unique part-file names
+from datetime import date, datetime  # Event timestamps and partition keys
+
+import pyarrow as pa  # Columnar in-memory tables
+import pyarrow.dataset as ds  # Partitioned dataset scanning with pushdown
+import pyarrow.parquet as pq  # Parquet file reading and writing
+
+from shared_cache import get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+# =======================
+# Configuration
+# =======================
+DEFAULT_EVENT_LOG_DIR = os.environ.get("IMMORTALIS_EVENT_LOG_DIR", os.path.join("analytics", "events"))
+PARTITION_FIELD = "date"  # Hive partition key, ISO formatted so string comparison orders by day
+COMPACT_LEASE_SECONDS = 600.0  # Far longer than merging one day's files takes
+
+# Wide, nullable schema shared by all event types; unused columns stay null and cost
+# almost nothing in Parquet. The partition column is not stored inside the files.
+EVENT_SCHEMA = pa.schema([
+    ("event_id", pa.string()),
+    ("event_type", pa.string()),  # e.g. "bio_age.quick", "bio_age.detailed", "community.post"
+    ("ts", pa.timestamp("ms")),
+    ("category", pa.string()),  # Community topic
+    ("content_length", pa.int32()),  # Post length instead of the post text itself
+    ("gender", pa.string()),
+    ("chronological_age", pa.float32()),
+    ("bio_age", pa.float32()),
+    ("bmi", pa.float32()),
+    ("sleep_hours", pa.float32()),
+    ("sleep_quality", pa.float32()),
+    ("exercise_hours", pa.float32()),
+    ("exercise_intensity", pa.float32()),
+    ("calories", pa.float32()),
+    ("veggie_servings", pa.float32()),
+    ("systolic_bp", pa.float32()),
+    ("cholesterol", pa.float32()),
+])
+PARTITIONING = ds.partitioning(pa.schema([(PARTITION_FIELD, pa.string())]), flavor="hive")
+
+
+# =======================
+# Event Log
+# =======================
+class EventLog:
+    """Buffered, append-only writer and range reader for the partitioned event dataset."""
+
+    def __init__(self, root=DEFAULT_EVENT_LOG_DIR, max_buffer=500, flush_interval=30.0,
+                 compact_interval=3600.0, compact_min_files=8, background=True, cache=None):
+        self.root = root
+        self.cache = cache  # SharedCache holding the per-partition compaction leases (default: the process-wide one)
+        self.max_buffer = max_buffer  # Flush once this many events are buffered
+        self.flush_interval = flush_interval  # ...or once the oldest buffered event is this old (seconds)
+        self.compact_interval = compact_interval  # Seconds between compaction passes
+        self.compact_min_files = compact_min_files  # Only compact partitions with at least this many files
+        self._buffer = []
+        self._buffer_started = None
+        self._lock = threading.Lock()  # Guards the in-memory buffer
+        self._io_lock = threading.Lock()  # Serializes this process's flushes and compaction on disk
+        self._last_compaction = time.monotonic()
+        self._stop = threading.Event()
+        self._wake = threading.Event()  # Set when the buffer is full, to flush without waiting for the next tick
+        self._thread = None
+        os.makedirs(self.root, exist_ok=True)
+        atexit.register(self.close)
+        if background:
+            self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+            self._thread.start()
+
+    # -----------------------
+    # Writing
+    # -----------------------
+    def append(self, event_type, **fields):
+        """Buffer one event; unknown fields are dropped so no free text leaks into the log."""
+        record = {name: fields.get(name) for name in EVENT_SCHEMA.names}
+        record["event_id"] = uuid.uuid4().hex
+        record["event_type"] = event_type
+        record["ts"] = fields.get("ts") or datetime.now()
+        with self._lock:
+            self._buffer.append(record)
+            if self._buffer_started is None:
+                self._buffer_started = time.monotonic()
+            should_flush = len(self._buffer) >= self.max_buffer
+        if should_flush:
+            if self._thread is not None:
+                self._wake.set()  # Flushed by the background thread, which may be busy compacting
+            else:
+                self.flush()
+
+    def flush(self):
+        """Write all buffered events, one new Parquet file per date partition."""
+        with self._lock:
+            records, self._buffer, self._buffer_started = self._buffer, [], None
+        if not records:
+            return 0
+        by_day = {}
+        for record in records:
+            by_day.setdefault(record["ts"].date().isoformat(), []).append(record)
+        with self._io_lock:
+            for day, rows in by_day.items():
+                table = pa.Table.from_pylist(rows, schema=EVENT_SCHEMA)
+                self._write_atomic(table, self._partition_dir(day), "part")
+        logger.info(f"Flushed {len(records)} analytics events to {len(by_day)} partition(s).")
+        return len(records)
+
+    def _partition_dir(self, day):
+        """Directory for one Hive-style date partition."""
+        path = os.path.join(self.root, f"{PARTITION_FIELD}={day}")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @staticmethod
+    def _write_atomic(table, directory, prefix):
+        """Write a table under a temporary name and rename it so readers never see partial files."""
+        name = f"{prefix}-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp_path = os.path.join(directory, f".{name}.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, os.path.join(directory, name))
+        return name
+
+    # -----------------------
+    # Compaction
+    # -----------------------
+    def compact(self, min_files=None):
+        """Merge small files in each partition into one file; returns the number of partitions compacted."""
+        min_files = self.compact_min_files if min_files is None else min_files
+        cache = self.cache or get_shared_cache()
+        compacted = 0
+        with self._io_lock:
+            for entry in sorted(os.listdir(self.root)):
+                directory = os.path.join(self.root, entry)
+                if not entry.startswith(f"{PARTITION_FIELD}=") or not os.path.isdir(directory):
+                    continue
+                if len([f for f in os.listdir(directory) if f.endswith(".parquet")]) < max(min_files, 2):
+                    continue
+                # Another process merging the same files would duplicate their events
+                lease = f"event-compact:{os.path.abspath(directory)}"
+                owner = cache.try_lease(lease, COMPACT_LEASE_SECONDS)
+                if owner is None:
+                    continue
+                try:
+                    compacted += self._compact_partition(directory, min_files)
+                finally:
+                    cache.release_lease(lease, owner)
+        if compacted:
+            logger.info(f"Compacted {compacted} analytics partition(s).")
+        self._last_compaction = time.monotonic()
+        return compacted
+
+    def _compact_partition(self, directory, min_files):
+        """Merge one partition's files, listed again under its lease; returns 1 if it was compacted."""
+        files = sorted(f for f in os.listdir(directory) if f.endswith(".parquet"))
+        if len(files) < max(min_files, 2):
+            return 0  # Compacted by another process since the first look
+        paths = [os.path.join(directory, f) for f in files]
+        table = pa.concat_tables(pq.read_table(p, schema=EVENT_SCHEMA) for p in paths)
+        self._write_atomic(table.sort_by("ts"), directory, "compacted")
+        for path in paths:
+            os.remove(path)
+        return 1
+
+    # -----------------------
+    # Reading
+    # -----------------------
+    def scan(self, start=None, end=None, columns=None, filter=None):
+        """Read events between two dates (inclusive) as a pyarrow Table.
+
+        Partitions outside the range are pruned by directory name; `columns` and
+        `filter` (a pyarrow.dataset expression) are pushed down into the Parquet scan.
+        """
+        dataset = ds.dataset(self.root, format="parquet", schema=EVENT_SCHEMA.append(
+            pa.field(PARTITION_FIELD, pa.string())), partitioning=PARTITIONING,
+            exclude_invalid_files=True, ignore_prefixes=[".", "_"])
+        expression = None
+        if start is not None:
+            expression = ds.field(PARTITION_FIELD) >= _day(start)
+        if end is not None:
+            upper = ds.field(PARTITION_FIELD) <= _day(end)
+            expression = upper if expression is None else expression & upper
+        if filter is not None:
+            expression = filter if expression is None else expression & filter
+        return dataset.to_table(columns=columns, filter=expression)
+
+    # -----------------------
+    # Lifecycle
+    # -----------------------
+    def _run(self):
+        """Background loop flushing aged buffers and compacting periodically."""
+        while True:
+            self._wake.wait(min(self.flush_interval, 5.0))
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                with self._lock:
+                    started, full = self._buffer_started, len(self._buffer) >= self.max_buffer
+                if started is not None and (full or time.monotonic() - started >= self.flush_interval):
+                    self.flush()
+                if time.monotonic() - self._last_compaction >= self.compact_interval:
+                    self.compact()
+            except Exception as e:
+                logger.error(f"Error in analytics event log worker: {str(e)}")
+
+    def close(self):
+        """Stop the background thread and flush anything still buffered."""
+        self._stop.set()
+        self._wake.set()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing analytics events on close: {str(e)}")
+
+
+def _day(value):
+    """Normalize a date, datetime or ISO string to a partition key."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    return str(value)[:10]
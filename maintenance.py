@@ -0,0 +1,204 @@
+# Homo Immortalis - Database Maintenance
+# ======================================
+# Description: Background upkeep for community.db.
+# Keeps the query planner's statistics fresh (ANALYZE on first run, then PRAGMA optimize,
+# which re-analyzes only tables whose contents changed notably), returns free pages left
+# by archiving and deletions to the filesystem with incremental vacuum, and truncates the
+# WAL. Every worker starts the background job, but one process at a time runs it (a
+# shared-cache lease), once per interval, at the first check after it is due when no
+# worker has served a script run for `quiet_seconds`; a run deferred past `max_defer_hours`
+# goes ahead anyway.
+# Incremental vacuum needs auto_vacuum = INCREMENTAL, which an existing database only gets
+# through a full VACUUM. That rewrites the whole file under an exclusive lock, so it is a
+# one-off step run by hand with the app stopped, never part of the background pass.
+# Usage: python maintenance.py run           (one pass now)
+#        python maintenance.py convert       (switch to incremental auto_vacuum; stop the app first)
+#        python maintenance.py bench         (read latency, default vs tuned settings)
+
+import argparse  # Command-line interface
+import logging  # Logging for error handling and debugging
+import os  # Benchmark scratch files
+import random  # Benchmark data
+import sqlite3  # Untuned baseline connections for the benchmark
+import statistics  # Benchmark summaries
+import tempfile  # Benchmark scratch directory
+import time  # Scheduling and timing
+from datetime import datetime, timedelta  # Benchmark timestamps
+
+from db import DB_PATH, connect, create_posts_table
+from shared_cache import get_shared_cache, run_periodic
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_VACUUM_PAGES = 2000  # Pages freed per pass (8 MB at the default 4 KB page size)
+AUTO_VACUUM_INCREMENTAL = 2
+JOB_NAME = "db-maintenance"
+ACTIVITY_KEY = "activity:last_script_run"  # Shared-cache mark: when any worker last served a script run
+ACTIVITY_WRITE_INTERVAL = 10.0  # Seconds between one process's activity updates
+
+_activity_noted = 0.0
+
+
+def database_stats(conn):
+    """Page, free-page and auto_vacuum figures for the main database."""
+    return {
+        "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+        "freelist_count": conn.execute("PRAGMA freelist_count").fetchone()[0],
+        "auto_vacuum": conn.execute("PRAGMA auto_vacuum").fetchone()[0],
+        "analyzed": conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is not None,
+    }
+
+
+def run_maintenance(conn, vacuum_pages=INCREMENTAL_VACUUM_PAGES):
+    """One maintenance pass; returns the database stats before and after.
+
+    Free pages are only released when the database uses incremental auto_vacuum
+    (see convert_auto_vacuum); otherwise they stay for reuse by later writes.
+    """
+    before = database_stats(conn)
+    conn.commit()
+    if not before["analyzed"]:
+        conn.execute("ANALYZE")
+    else:
+        conn.execute("PRAGMA optimize")
+    if before["auto_vacuum"] == AUTO_VACUUM_INCREMENTAL and before["freelist_count"]:
+        conn.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})").fetchall()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+    after = database_stats(conn)
+    logger.info(f"Database maintenance: {before['page_count']} -> {after['page_count']} pages, "
+                f"{before['freelist_count']} -> {after['freelist_count']} free.")
+    return before, after
+
+
+def convert_auto_vacuum(conn):
+    """Switch the database to incremental auto_vacuum with a full VACUUM; returns False if already converted.
+
+    The VACUUM rewrites the whole file and blocks every other connection until it is
+    done, and needs free disk space for a second copy; run it with the app stopped.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == AUTO_VACUUM_INCREMENTAL:
+        return False
+    conn.commit()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")  # Takes effect only through a full rebuild of the file
+    logger.info("Converted the database to incremental auto_vacuum.")
+    return True
+
+
+# =======================
+# Scheduling
+# =======================
+def note_activity(cache=None):
+    """Record that this process just served a script run; throttled to one shared write per interval."""
+    global _activity_noted
+    now = time.time()
+    if now - _activity_noted < ACTIVITY_WRITE_INTERVAL:
+        return
+    _activity_noted = now
+    try:
+        (cache or get_shared_cache()).mark(ACTIVITY_KEY, now)
+    except Exception as e:
+        logger.error(f"Error recording activity: {str(e)}")
+
+
+def start_maintenance(path=DB_PATH, interval_hours=24.0, check_seconds=300.0, quiet_seconds=300.0,
+                      max_defer_hours=24.0, cache=None):
+    """Run maintenance about once per `interval_hours` across all workers, at a quiet moment; returns a stop Event."""
+
+    def ready():
+        shared = cache or get_shared_cache()
+        last_activity = shared.last_mark(ACTIVITY_KEY)
+        if last_activity is None or time.time() - last_activity >= quiet_seconds:
+            return True
+        last_run = shared.last_mark(f"job:{JOB_NAME}:last_run")
+        return last_run is not None and time.time() - last_run >= (interval_hours + max_defer_hours) * 3600  # Overdue
+
+    def job():
+        conn = connect(path)
+        try:
+            run_maintenance(conn)
+        finally:
+            conn.close()
+
+    return run_periodic(JOB_NAME, interval_hours * 3600, job, check_seconds=check_seconds, lease_seconds=3600.0,
+                        ready=ready, cache=cache)
+
+
+# =======================
+# Benchmark
+# =======================
+def _populate(path, posts, churn):
+    """A community.db-shaped database whose posts have seen `churn` of their rows deleted."""
+    conn = sqlite3.connect(path)
+    create_posts_table(conn)
+    rng = random.Random(42)
+    words = ["sleep", "magnesium", "zone2", "protein", "sauna", "fasting", "vo2max", "creatine", "glucose", "hrv"]
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(posts):
+        content = " ".join(rng.choice(words) for _ in range(rng.randint(20, 120)))
+        stamp = (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M")
+        rows.append((rng.choice(["Sleep", "Exercise", "Nutrition", "Biomarkers"]), content, stamp, f"<p>{content}</p>", 1))
+    with conn:
+        conn.executemany("INSERT INTO posts (category, content, timestamp, content_html, render_version) "
+                         "VALUES (?, ?, ?, ?, ?)", rows)
+        conn.execute("DELETE FROM posts WHERE id % 100 < ?", (int(churn * 100),))
+    conn.close()
+
+
+def _time_reads(conn, rounds):
+    """Median milliseconds of the Community page's read queries."""
+    queries = [
+        ("recent page", "SELECT * FROM posts ORDER BY timestamp DESC, id DESC LIMIT 5 OFFSET 0", []),
+        ("deep page", "SELECT * FROM posts ORDER BY timestamp DESC, id DESC LIMIT 5 OFFSET 5000", []),
+        ("search (miss)", "SELECT * FROM posts WHERE content LIKE ? OR category LIKE ? ORDER BY timestamp DESC, id DESC "
+                           "LIMIT 5 OFFSET 0", ["%rapamycin%"] * 2),
+        ("count", "SELECT COUNT(*) FROM posts WHERE category = ?", ["Sleep"]),
+    ]
+    results = {}
+    for name, sql, params in queries:
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = statistics.median(samples)
+    return results
+
+
+def benchmark(posts=200000, churn=0.3, rounds=20):
+    """Compare read latency with SQLite defaults against DB_PRAGMAS, conversion and one maintenance pass."""
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "bench.db")
+        _populate(path, posts, churn)
+        size_before = os.path.getsize(path)
+        baseline = sqlite3.connect(path)
+        before = _time_reads(baseline, rounds)
+        baseline.close()
+        tuned = connect(path)
+        convert_auto_vacuum(tuned)
+        run_maintenance(tuned)
+        after = _time_reads(tuned, rounds)
+        tuned.close()
+        size_after = os.path.getsize(path)
+    print(f"{posts} posts, {int(churn * 100)}% deleted; file {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+    print(f"{'query':<15} {'default ms':>11} {'tuned ms':>9}")
+    for name in before:
+        print(f"{name:<15} {before[name]:>11.2f} {after[name]:>9.2f}")
+    return before, after
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Maintain community.db or benchmark its settings.")
+    parser.add_argument("command", choices=["run", "convert", "bench"])
+    parser.add_argument("--db", default=DB_PATH, help="Path to community.db")
+    parser.add_argument("--posts", type=int, default=200000, help="Benchmark database size")
+    args = parser.parse_args()
+    if args.command == "run":
+        run_maintenance(connect(args.db))
+    elif args.command == "convert":
+        if not convert_auto_vacuum(connect(args.db)):
+            print("Already using incremental auto_vacuum.")
+    else:
+        benchmark(args.posts)
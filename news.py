@@ -0,0 +1,160 @@
+# Homo Immortalis - Scientific News Fetching
+# ==========================================
+# Description: Deadline-bounded, non-blocking PubMed feed fetching.
+# The network fetch runs on a background worker instead of the script thread, with a
+# connect/read timeout, exponential-backoff retries (tenacity) and a circuit breaker
+# that stops calling a failing source for a cool-down period. A page render waits at
+# most `deadline` seconds and otherwise shows the last good entries (or a placeholder).
+# One NewsFetcher is shared by all sessions, so its cache and breaker state are too; with a
+# SharedCache, one fetch per refresh interval also serves every other server process.
+
+import logging  # Logging for error handling and debugging
+import threading  # Lock around shared fetcher state
+import time  # Monotonic clock for cache age and breaker cool-down
+from concurrent.futures import ThreadPoolExecutor  # Off-thread fetches
+
+import feedparser  # RSS parsing for fetching scientific news from PubMed
+import requests  # HTTP client with real timeouts
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter  # Retries
+
+logger = logging.getLogger(__name__)
+
+PUBMED_FEED_URL = "https://pubmed.ncbi.nlm.nih.gov/rss/search/?term=(longevity+OR+aging+OR+healthspan)+AND+2025&limit=10&sort=date"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a fetch is skipped because the source's circuit breaker is open."""
+
+
+# =======================
+# Circuit Breaker
+# =======================
+class CircuitBreaker:
+    """Classic closed/open/half-open breaker.
+
+    After `failure_threshold` consecutive failures the breaker opens and rejects calls
+    for `reset_timeout` seconds; then a single trial call is let through (half-open),
+    whose outcome closes or re-opens the breaker.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold=3, reset_timeout=300.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True if a call may proceed now."""
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return self.state == self.CLOSED
+
+    def record_success(self):
+        """Close the breaker after a successful call."""
+        with self._lock:
+            self.state, self.failures, self.opened_at = self.CLOSED, 0, None
+
+    def record_failure(self):
+        """Count a failed call, opening the breaker at the threshold or after a failed trial."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"News source circuit opened after {self.failures} failure(s).")
+                self.state, self.opened_at = self.OPEN, self.clock()
+
+
+# =======================
+# Fetcher
+# =======================
+class NewsFetcher:
+    """Shared, cached feed fetcher that never blocks a render longer than its deadline."""
+
+    def __init__(self, url=PUBMED_FEED_URL, timeout=(3.05, 10.0), attempts=3, refresh_interval=900.0,
+                 breaker=None, shared=None):
+        self.url = url
+        self.timeout = timeout  # (connect, read) seconds passed to requests
+        self.attempts = attempts
+        self.refresh_interval = refresh_interval  # Seconds a successful fetch stays fresh
+        self.breaker = breaker or CircuitBreaker()
+        self.shared = shared  # Optional SharedCache so only one server process fetches per refresh
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="news-fetch")
+        self._lock = threading.RLock()  # Re-entrant: done callbacks can fire while get() holds it
+        self._entries = []
+        self._fetched_at = None
+        self._inflight = None
+        self.last_error = None
+
+    def _download(self):
+        """Fetch the feed bytes with timeouts and exponential-backoff retries."""
+        retrying = Retrying(stop=stop_after_attempt(self.attempts), wait=wait_exponential_jitter(initial=0.5, max=8),
+                            retry=retry_if_exception_type(requests.RequestException), reraise=True)
+        for attempt in retrying:
+            with attempt:
+                response = requests.get(self.url, timeout=self.timeout,
+                                        headers={"User-Agent": "HomoImmortalis/1.0"})
+                response.raise_for_status()
+                return response.content
+
+    def _fetch_entries(self):
+        """Download and parse the feed through the breaker."""
+        if not self.breaker.allow():
+            raise CircuitOpenError("PubMed is temporarily unavailable.")
+        try:
+            feed = feedparser.parse(self._download())
+            if feed.bozo and not feed.entries:
+                raise ValueError(f"Unparseable feed: {feed.bozo_exception}")
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        # Plain dicts rather than feedparser objects, so entries are cheap to copy and cache
+        return [{"title": e.get("title", ""), "link": e.get("link", ""), "published": e.get("published", ""),
+                 "summary": e.get("summary", "")} for e in feed.entries]
+
+    def _refresh(self):
+        """Worker-thread body: fetch (or take another worker process's fetch) and update the cache."""
+        if self.shared is None:
+            entries = self._fetch_entries()
+        else:
+            entries = self.shared.get_or_compute(f"news:{self.url}", self._fetch_entries, self.refresh_interval)
+        with self._lock:
+            self._entries, self._fetched_at, self.last_error = entries, time.monotonic(), None
+        return entries
+
+    def _on_done(self, future):
+        """Record the outcome of a background fetch and allow the next one to start."""
+        with self._lock:
+            self._inflight = None
+            error = future.exception()
+            if error is not None:
+                self.last_error = str(error)
+                if not isinstance(error, CircuitOpenError):  # Open-circuit skips are expected, not errors
+                    logger.error(f"Error fetching news feed: {str(error)}")
+
+    def get(self, deadline=2.0):
+        """Return (entries, fresh) within `deadline` seconds.
+
+        Fresh cached entries return immediately. Otherwise one background refresh is
+        started (shared by concurrent callers) and awaited up to the deadline; if it is
+        not done by then, the last good entries are returned with fresh=False.
+        """
+        with self._lock:
+            if self._fetched_at is not None and time.monotonic() - self._fetched_at < self.refresh_interval:
+                return list(self._entries), True
+            inflight = self._inflight
+            if inflight is None:
+                inflight = self._inflight = self._executor.submit(self._refresh)
+                inflight.add_done_callback(self._on_done)  # May run right here if already done
+            stale = list(self._entries)
+        try:
+            return inflight.result(timeout=deadline), True
+        except Exception:
+            return stale, False  # Deadline exceeded or fetch failed: serve what we have
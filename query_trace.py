@@ -0,0 +1,225 @@
+# Homo Immortalis - SQL Tracing
+# =============================
+# Description: Slow-query log for community.db connections.
+# db.connect() opens connections with TracingConnection, whose cursors time every
+# statement (execute plus fetching its rows). Statements slower than the threshold are
+# kept in a bounded ring buffer together with the shape of their parameters (types, never
+# values) and their EXPLAIN QUERY PLAN, with full table scans and temp B-tree sorts
+# flagged. The buffer is shown on the Admin page and can be downloaded as JSON Lines.
+# Settings: IMMORTALIS_SLOW_QUERY_MS (default 50), IMMORTALIS_SQL_TRACE=0 to disable.
+
+import json  # Dumping the slow-query log
+import logging  # Logging for error handling and debugging
+import os  # Settings from the environment
+import re  # Plan flag detection
+import sqlite3  # Connection and cursor subclasses
+import threading  # Guarding the ring buffer
+import time  # Statement timing
+from collections import deque  # Bounded ring buffer
+from datetime import datetime  # Record timestamps
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.environ.get("IMMORTALIS_SLOW_QUERY_MS", "50"))
+TRACE_ENABLED = os.environ.get("IMMORTALIS_SQL_TRACE", "1") != "0"
+RING_SIZE = 500
+PLAN_CACHE_SIZE = 256
+
+# Statements EXPLAIN QUERY PLAN says nothing useful about
+_UNPLANNABLE = re.compile(r"^\s*(PRAGMA|ATTACH|DETACH|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|CREATE|DROP|ALTER|VACUUM|ANALYZE|EXPLAIN)\b", re.I)
+_FULL_SCAN = re.compile(r"^SCAN (\S+)$")  # "SCAN t USING [COVERING] INDEX" walks an index instead
+
+
+def param_shape(parameters, many=False):
+    """Describe bound parameters by type only, so the log never holds user content."""
+    if many:
+        rows = parameters if isinstance(parameters, (list, tuple)) else list(parameters)
+        return f"{len(rows)} rows x {param_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    return "(" + ", ".join(type(v).__name__ for v in parameters or ()) + ")"
+
+
+def plan_flags(plan):
+    """Flag full table scans and temp B-tree sorts/groupings in EXPLAIN QUERY PLAN lines."""
+    flags = []
+    for line in plan:
+        match = _FULL_SCAN.match(line)
+        if match:
+            flags.append(f"full scan of {match.group(1)}")
+        elif line.startswith("USE TEMP B-TREE"):
+            flags.append(f"temp b-tree ({line[len('USE TEMP B-TREE FOR '):].lower()})")
+    return flags
+
+
+# =======================
+# Slow-Query Log
+# =======================
+class QueryTracer:
+    """Thread-safe ring buffer of slow statements with their query plans."""
+
+    def __init__(self, threshold_ms=SLOW_QUERY_MS, capacity=RING_SIZE):
+        self.threshold_ms = threshold_ms
+        self.records = deque(maxlen=capacity)
+        self.statements = 0
+        self._plans = {}  # SQL text -> plan lines; plans depend on the text, not on the values
+        self._lock = threading.Lock()
+
+    def observe(self, conn, sql, parameters, elapsed, many=False):
+        """Count a finished statement and keep it if it was slower than the threshold."""
+        self.statements += 1
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+        plan = self._plan(conn, sql, parameters, many)
+        record = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "ms": round(elapsed_ms, 2),
+            "sql": " ".join(sql.split()),
+            "params": param_shape(parameters, many),
+            "plan": plan,
+            "flags": plan_flags(plan),
+        }
+        with self._lock:
+            self.records.append(record)
+        logger.warning(f"Slow query ({record['ms']} ms): {record['sql'][:200]} {record['flags'] or ''}")
+
+    def _plan(self, conn, sql, parameters, many):
+        """EXPLAIN QUERY PLAN for a statement, cached per SQL text."""
+        if sql in self._plans:
+            return self._plans[sql]
+        if _UNPLANNABLE.match(sql):
+            return []
+        if many:
+            parameters = next(iter(parameters), ())
+        try:
+            # The base class execute bypasses tracing, so explaining is never itself traced
+            rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        except sqlite3.Error as e:
+            return [f"(plan unavailable: {str(e)})"]
+        depth = {0: -1}
+        plan = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            plan.append("  " * depth[node] + detail)
+        with self._lock:
+            if len(self._plans) >= PLAN_CACHE_SIZE:
+                self._plans.clear()
+            self._plans[sql] = plan
+        return plan
+
+    def snapshot(self):
+        """Slow-query records, newest first."""
+        with self._lock:
+            return list(reversed(self.records))
+
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+
+    def to_jsonl(self):
+        """The buffer as JSON Lines text, oldest first."""
+        return "".join(json.dumps(record) + "\n" for record in reversed(self.snapshot()))
+
+    def dump(self, path):
+        """Write the buffer to `path` as JSON Lines (oldest first); returns records written."""
+        text = self.to_jsonl()
+        with open(path, "w") as f:
+            f.write(text)
+        return text.count("\n")
+
+
+TRACER = QueryTracer()
+
+
+# =======================
+# Tracing Connection
+# =======================
+class TracingCursor(sqlite3.Cursor):
+    """Cursor timing each statement from execute until its rows are consumed."""
+
+    _pending = None  # (sql, parameters, seconds so far) of a statement whose rows are being read
+
+    def _finish(self):
+        if self._pending is not None:
+            sql, parameters, elapsed = self._pending
+            self._pending = None
+            self.connection.tracer.observe(self.connection, sql, parameters, elapsed)
+
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if self._pending is not None:
+                sql, parameters, elapsed = self._pending
+                self._pending = sql, parameters, elapsed + time.perf_counter() - start
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        result = super().execute(sql, parameters)
+        elapsed = time.perf_counter() - start
+        if self.description is None:
+            self.connection.tracer.observe(self.connection, sql, parameters, elapsed)
+        else:
+            self._pending = sql, parameters, elapsed  # Completed once the rows have been read
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        seq_of_parameters = list(seq_of_parameters)
+        start = time.perf_counter()
+        result = super().executemany(sql, seq_of_parameters)
+        self.connection.tracer.observe(self.connection, sql, seq_of_parameters, time.perf_counter() - start, many=True)
+        return result
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, size or self.arraysize)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            return self._timed(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # conn.execute(...).fetchone() never exhausts its cursor; report it when it is dropped
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class TracingConnection(sqlite3.Connection):
+    """Connection whose cursors (including the conn.execute shortcuts) report to a QueryTracer."""
+
+    tracer = TRACER
+
+    def cursor(self, factory=TracingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
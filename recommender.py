@@ -0,0 +1,393 @@
+# Homo Immortalis - Related Content Recommender
+# =============================================
+# Description: Offline TF-IDF index powering the "Related" panels under posts and articles.
+# The index is built offline into a directory of .npy arrays (inverted postings and
+# per-document vectors) that are opened with mmap_mode="r", so every worker process maps
+# the same pages from the OS cache instead of holding its own copy. New posts and articles
+# are vectorized against the frozen vocabulary and appended to a shared delta log, which
+# all workers replay, until the next rebuild folds them into the base index.
+# Nearest-neighbour lookups accumulate scores over the query's postings lists only, which
+# keeps them in the low milliseconds for a forum-sized corpus.
+# Usage (cron or manual): python recommender.py build
+
+import argparse  # Command-line interface for offline builds
+import json  # Vocabulary, document metadata and delta log
+import logging  # Logging for error handling and debugging
+import math  # IDF and TF weighting
+import os  # Index directory management
+import re  # Tokenization
+import shutil  # Replacing old index versions
+import threading  # Guarding reloads and delta replay
+import time  # Version names
+from collections import Counter  # Term frequencies
+
+import numpy as np  # Postings arrays and score accumulation
+
+from db import DB_PATH, connect
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = os.environ.get("IMMORTALIS_RELATED_INDEX", os.path.join(".cache", "related_index"))
+CURRENT_FILE = "CURRENT"  # Names the active version directory; swapped atomically on rebuild
+DELTA_FILE = "delta.jsonl"  # Documents added since the last build
+MIN_SCORE = 0.05
+REBUILD_DELTA = 500  # Rebuild early once the delta holds this many documents
+VERSION_GRACE_SECONDS = 3600  # Superseded index versions are deleted only after this long
+BUILD_LEASE = "related-index-build"
+BUILD_LEASE_SECONDS = 1800
+
+_TOKEN = re.compile(r"[a-z][a-z0-9]{2,}")
+STOPWORDS = frozenset("""
+the and for are but not you all any can had her was one our out has have been from they will with this that
+what when where which who why how their there them then than these those into about after before over under
+your yours just also very more most some such only other its it's were would could should while each few
+""".split())
+
+
+def tokenize(text):
+    """Lowercased word tokens of at least three characters, minus stopwords."""
+    return [t for t in _TOKEN.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def _weigh(counts, vocab, idf):
+    """Sublinear TF-IDF weights for known terms, L2-normalized; returns (term_ids, weights)."""
+    terms = [(vocab[t], (1 + math.log(c)) * idf[vocab[t]]) for t, c in counts.items() if t in vocab]
+    if not terms:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    ids = np.array([t for t, _ in terms], dtype=np.int32)
+    weights = np.array([w for _, w in terms], dtype=np.float32)
+    return ids, weights / np.linalg.norm(weights)
+
+
+# =======================
+# Offline Build
+# =======================
+def build_index(docs, path=DEFAULT_INDEX_DIR, min_df=1, max_df_ratio=0.5):
+    """Build a new index version from (key, title, text) documents and make it current.
+
+    Terms appearing in more than `max_df_ratio` of documents carry little signal and
+    produce the longest postings lists, so they are dropped from the vocabulary.
+    """
+    keys, titles, counts, texts = [], [], [], {}
+    for key, title, text in docs:
+        keys.append(key)
+        titles.append(title)
+        counts.append(Counter(tokenize(f"{title} {text}")))
+        if not key.startswith("post:"):
+            texts[key] = text  # Posts are re-read from the database on rebuild; other sources are not
+    n = len(keys)
+    df = Counter(t for c in counts for t in c)
+    max_df = max(1, int(max_df_ratio * n)) if n > 10 else n
+    vocab = {t: i for i, t in enumerate(sorted(t for t, d in df.items() if min_df <= d <= max_df))}
+    idf = np.zeros(len(vocab), dtype=np.float32)
+    for term, i in vocab.items():
+        idf[i] = math.log((1 + n) / (1 + df[term])) + 1
+
+    doc_ptr = np.zeros(n + 1, dtype=np.int64)
+    doc_terms, doc_weights = [], []
+    for d, c in enumerate(counts):
+        ids, weights = _weigh(c, vocab, idf)
+        doc_terms.append(ids)
+        doc_weights.append(weights)
+        doc_ptr[d + 1] = doc_ptr[d] + len(ids)
+    doc_terms = np.concatenate(doc_terms) if n else np.zeros(0, dtype=np.int32)
+    doc_weights = np.concatenate(doc_weights) if n else np.zeros(0, dtype=np.float32)
+
+    # Invert into term-major postings (CSC layout) for query-time accumulation
+    doc_of_entry = np.repeat(np.arange(n, dtype=np.int32), np.diff(doc_ptr))
+    order = np.argsort(doc_terms, kind="stable")
+    post_docs, post_weights = doc_of_entry[order], doc_weights[order]
+    term_ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(doc_terms, minlength=len(vocab)), out=term_ptr[1:])
+
+    os.makedirs(path, exist_ok=True)
+    version = f"v{int(time.time() * 1000)}"
+    target = os.path.join(path, version)
+    os.makedirs(target)
+    arrays = {"doc_ptr": doc_ptr, "doc_terms": doc_terms, "doc_weights": doc_weights,
+              "term_ptr": term_ptr, "post_docs": post_docs, "post_weights": post_weights, "idf": idf}
+    for name, array in arrays.items():
+        np.save(os.path.join(target, f"{name}.npy"), array)
+    with open(os.path.join(target, "meta.json"), "w") as f:
+        json.dump({"vocab": vocab, "keys": keys, "titles": titles, "texts": texts}, f)
+    # Publish: swap CURRENT, start an empty delta, then drop older versions
+    tmp = os.path.join(path, CURRENT_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(version)
+    open(os.path.join(target, DELTA_FILE), "w").close()
+    os.replace(tmp, os.path.join(path, CURRENT_FILE))
+    # Workers may still have an older version mapped or be appending to its delta; keep
+    # superseded versions for a grace period instead of deleting them from under readers
+    cutoff = (time.time() - VERSION_GRACE_SECONDS) * 1000
+    for entry in os.listdir(path):
+        if (entry.startswith("v") and entry != version and entry[1:].isdigit() and int(entry[1:]) < cutoff
+                and os.path.isdir(os.path.join(path, entry))):
+            shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+    logger.info(f"Built related-content index {version}: {n} documents, {len(vocab)} terms.")
+    return version
+
+
+# =======================
+# Query-time Index
+# =======================
+class RelatedIndex:
+    """Memory-mapped TF-IDF index with a replayed delta of documents added since the build.
+
+    One instance is shared by all sessions of a process: reloads, delta replay and
+    appends run under the lock, and lookups score a snapshot taken under it.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_DIR):
+        self.path = path
+        self.version = None
+        self._lock = threading.RLock()
+        self._delta = {}  # key -> (title, term_ids, weights)
+        self._delta_offset = 0
+        self._reload()
+
+    def _reload(self):
+        """Map the current version if it changed and replay new delta lines; cheap when nothing changed."""
+        with self._lock:
+            try:
+                with open(os.path.join(self.path, CURRENT_FILE)) as f:
+                    version = f.read().strip()
+            except FileNotFoundError:
+                return False
+            if version != self.version:
+                directory = os.path.join(self.path, version)
+                for name in ("doc_ptr", "doc_terms", "doc_weights", "term_ptr", "post_docs", "post_weights", "idf"):
+                    setattr(self, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r"))
+                with open(os.path.join(directory, "meta.json")) as f:
+                    meta = json.load(f)
+                self.vocab, self.keys, self.titles, self.texts = meta["vocab"], meta["keys"], meta["titles"], meta["texts"]
+                self.positions = {key: i for i, key in enumerate(self.keys)}
+                self.version, self._delta, self._delta_offset = version, {}, 0
+            self._replay_delta()
+            return True
+
+    def _replay_delta(self):
+        """Read delta lines appended by any worker since our last look; call with self._lock held.
+
+        The delta dict and texts are replaced, never mutated, so a snapshot taken by a
+        concurrent lookup stays valid while it is scored.
+        """
+        delta_path = os.path.join(self.path, self.version, DELTA_FILE)
+        try:
+            if os.path.getsize(delta_path) <= self._delta_offset:
+                return
+            delta, texts = dict(self._delta), None
+            with open(delta_path) as f:
+                f.seek(self._delta_offset)
+                for line in f:
+                    if not line.endswith("\n"):
+                        break  # Partially written line; pick it up next time
+                    self._delta_offset += len(line.encode())
+                    try:
+                        record = json.loads(line)
+                    except ValueError as e:
+                        logger.warning(f"Skipping unreadable related-content delta line: {str(e)}")
+                        continue
+                    delta[record["key"]] = (record["title"], np.array(record["terms"], dtype=np.int32),
+                                            np.array(record["weights"], dtype=np.float32))
+                    if record.get("text") is not None and not record["key"].startswith("post:"):
+                        texts = texts if texts is not None else dict(self.texts)
+                        texts[record["key"]] = record["text"]  # Posts are re-read from the database
+            self._delta = delta
+            if texts is not None:
+                self.texts = texts
+        except FileNotFoundError:
+            pass
+
+    def _snapshot(self):
+        """One consistent view of the mapped version and its delta, safe to use outside the lock."""
+        with self._lock:
+            return (self.keys, self.titles, self.positions, self.doc_ptr, self.doc_terms, self.doc_weights,
+                    self.term_ptr, self.post_docs, self.post_weights, self.vocab, self.idf, self._delta)
+
+    @property
+    def ready(self):
+        """True once an index has been built."""
+        return self.version is not None
+
+    def __contains__(self, key):
+        return key in self.positions or key in self._delta if self.ready else False
+
+    def add(self, key, title, text):
+        """Vectorize a new document with the frozen vocabulary and append it to the shared delta log.
+
+        Best effort: the document is already stored, so a failure here is only logged.
+        """
+        try:
+            with self._lock:
+                if not self._reload() or key in self:
+                    return
+                ids, weights = _weigh(Counter(tokenize(f"{title} {text}")), self.vocab, self.idf)
+                record = {"key": key, "title": title, "terms": ids.tolist(), "weights": weights.round(5).tolist(),
+                          "text": text}
+                with open(os.path.join(self.path, self.version, DELTA_FILE), "a") as f:
+                    f.write(json.dumps(record) + "\n")  # One small append per document; readers skip partial lines
+                self._replay_delta()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not add {key} to the related-content index: {str(e)}")
+
+    @staticmethod
+    def _vector(snapshot, key):
+        """(term_ids, weights) of an indexed document, or None."""
+        _, _, positions, doc_ptr, doc_terms, doc_weights, _, _, _, _, _, delta = snapshot
+        if key in delta:
+            return delta[key][1:]
+        position = positions.get(key)
+        if position is None:
+            return None
+        start, end = doc_ptr[position], doc_ptr[position + 1]
+        return doc_terms[start:end], doc_weights[start:end]
+
+    def related(self, key, k=5, prefix=None):
+        """Top-k (key, title, score) most similar to an indexed document, optionally limited to a key prefix."""
+        self._reload()
+        if not self.ready:
+            return []
+        snapshot = self._snapshot()
+        vector = self._vector(snapshot, key)
+        if vector is None:
+            return []
+        return self._top(snapshot, vector, k, exclude=key, prefix=prefix)
+
+    def similar_to_text(self, text, k=5, prefix=None):
+        """Top-k documents similar to arbitrary text (e.g. an article not yet indexed)."""
+        self._reload()
+        if not self.ready:
+            return []
+        snapshot = self._snapshot()
+        vocab, idf = snapshot[9], snapshot[10]
+        return self._top(snapshot, _weigh(Counter(tokenize(text)), vocab, idf), k, prefix=prefix)
+
+    @staticmethod
+    def _top(snapshot, vector, k, exclude=None, prefix=None):
+        """Score base documents through the postings of the query's terms, plus the delta documents."""
+        keys, titles, _, _, _, _, term_ptr, post_docs, post_weights, _, _, delta = snapshot
+        term_ids, weights = vector
+        scores = np.zeros(len(keys), dtype=np.float32)
+        for term, weight in zip(term_ids, weights):
+            start, end = term_ptr[term], term_ptr[term + 1]
+            np.add.at(scores, post_docs[start:end], weight * post_weights[start:end])
+        query = dict(zip(term_ids.tolist(), weights.tolist()))
+        candidates = []
+        if len(scores):
+            top = np.argpartition(-scores, min(k * 2, len(scores) - 1))[:k * 2 + 1]
+            candidates = [(keys[i], titles[i], float(scores[i])) for i in top]
+        for key, (title, ids, doc_weights) in delta.items():
+            score = sum(query.get(t, 0.0) * w for t, w in zip(ids.tolist(), doc_weights.tolist()))
+            candidates.append((key, title, score))
+        results = sorted((c for c in candidates if c[0] != exclude and c[2] >= MIN_SCORE
+                          and (prefix is None or c[0].startswith(prefix))), key=lambda c: -c[2])
+        return results[:k]
+
+
+# =======================
+# Corpus
+# =======================
+def post_title(content, length=60):
+    """Short display title for a post."""
+    text = " ".join((content or "").split())
+    return text if len(text) <= length else text[:length - 1] + "…"
+
+
+def iter_post_docs(conn):
+    """(key, title, text) for every post, hot and archived."""
+    from archive import ARCHIVE_SCHEMA, archive_exists, attach_archive
+    schemas = ["main"]
+    if archive_exists():
+        attach_archive(conn)
+        schemas.append(ARCHIVE_SCHEMA)
+    for schema in schemas:
+        for post_id, category, content in conn.execute(f"SELECT id, category, content FROM {schema}.posts"):
+            yield f"post:{post_id}", post_title(content), f"{category} {content}"
+
+
+def _carry_over(path, version, offset):
+    """Re-add delta lines written to the superseded `version` after offset `offset`."""
+    index = RelatedIndex(path)
+    carried = 0
+    try:
+        with open(os.path.join(path, version, DELTA_FILE)) as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                record = json.loads(line)
+                if record.get("text") is not None:
+                    index.add(record["key"], record["title"], record["text"])
+                    carried += 1
+    except FileNotFoundError:
+        return 0
+    return carried
+
+
+def rebuild(conn, path=DEFAULT_INDEX_DIR, wait=False, wait_seconds=BUILD_LEASE_SECONDS):
+    """Rebuild from all posts plus the articles and insights known to the current index.
+
+    Only one process builds at a time (a SharedCache lease). Others return None at once,
+    or with `wait`, once the build they deferred to has been published. Documents added
+    to the old version while the build ran are carried over to the new one.
+    """
+    from shared_cache import get_shared_cache
+    shared = get_shared_cache()
+    owner = shared.try_lease(BUILD_LEASE, BUILD_LEASE_SECONDS)
+    if owner is None:
+        deadline = time.monotonic() + (wait_seconds if wait else 0)
+        while time.monotonic() < deadline and not RelatedIndex(path).ready:
+            time.sleep(0.5)
+        return None
+    try:
+        previous = RelatedIndex(path)
+        docs = list(iter_post_docs(conn))
+        if previous.ready:
+            titles = dict(zip(previous.keys, previous.titles))
+            titles.update((key, record[0]) for key, record in previous._delta.items())
+            docs += [(key, titles[key], text) for key, text in previous.texts.items() if key in titles]
+        version = build_index(docs, path)
+        if previous.ready:
+            carried = _carry_over(path, previous.version, previous._delta_offset)
+            if carried:
+                logger.info(f"Carried {carried} documents added during the rebuild into {version}.")
+        return version
+    finally:
+        shared.release_lease(BUILD_LEASE, owner)
+
+
+def start_rebuilder(path=DB_PATH, interval_hours=6.0, index_path=DEFAULT_INDEX_DIR, check_seconds=60):
+    """Keep the index fresh from every worker, with one process rebuilding at a time.
+
+    Rebuilds every `interval_hours`, or sooner once the delta outgrows the base index or
+    reaches REBUILD_DELTA documents: new terms are only picked up on rebuild, which
+    matters most for a young corpus.
+    """
+    from shared_cache import run_periodic
+    index = RelatedIndex(index_path)
+
+    def delta_outgrown():
+        index._reload()
+        delta_size = len(index._delta) if index.ready else 0
+        return delta_size > len(getattr(index, "keys", [])) or delta_size >= REBUILD_DELTA
+
+    def job():
+        conn = connect(path)
+        try:
+            rebuild(conn, index_path)
+        finally:
+            conn.close()
+
+    return run_periodic("related-index", interval_hours * 3600, job, check_seconds,
+                        lease_seconds=BUILD_LEASE_SECONDS, force=delta_outgrown)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Build the related-content TF-IDF index.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--db", default=DB_PATH, help="Path to community.db")
+    parser.add_argument("--index", default=DEFAULT_INDEX_DIR, help="Index directory")
+    args = parser.parse_args()
+    if rebuild(connect(args.db), args.index, wait=True) is None:
+        print("Another process is building the index; skipped.")
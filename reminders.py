@@ -0,0 +1,200 @@
+# Homo Immortalis - Notebook Reminders
+# ====================================
+# Description: Persistent reminders for the Personal Notebook.
+# Reminders live in SQLite, indexed on next-fire time, and are driven by a background
+# scheduler thread that sleeps until the earliest active reminder is due, so nothing
+# scans all reminders per rerun or per session. Every worker process runs a scheduler on
+# the same tables: a reminder is fired by whichever worker first claims its row (an
+# UPDATE conditioned on the next-fire time it read), so it fires once, and adds, cancels
+# and notifications are visible to all workers. Fired reminders are delivered in-app
+# through a per-user inbox read from reminder_notifications, so both the schedule and
+# undelivered notifications survive restarts.
+# Recurrence rules: None (one-off), "hourly", "daily", "weekly" or "every:<N><m|h|d>".
+# The clock is injectable and run_pending() processes due reminders synchronously,
+# which keeps the scheduler deterministic under a fake clock.
+
+import logging  # Logging for error handling and debugging
+import re  # Recurrence rule parsing
+import sqlite3  # Persistent storage of reminders and notifications
+import threading  # Scheduler thread, condition variable and locks
+import time  # Default wall clock
+
+from db import apply_pragmas
+
+logger = logging.getLogger(__name__)
+
+REMINDERS_DB_PATH = 'community.db'
+RECURRENCE_PRESETS = {"hourly": 3600, "daily": 86400, "weekly": 7 * 86400}
+_EVERY = re.compile(r"^every:(\d+)([mhd])$")
+_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400}
+MAX_IDLE_WAIT = 60.0  # Upper bound on one wait, so changes by other workers and clocks are picked up
+
+
+def create_reminder_tables(conn):
+    """Create the reminders and delivered-notification tables if missing."""
+    conn.execute('''CREATE TABLE IF NOT EXISTS reminders
+                    (id INTEGER PRIMARY KEY, user_id TEXT, message TEXT, next_fire REAL,
+                     rule TEXT, active INTEGER DEFAULT 1)''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_user ON reminders (user_id, active)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_due ON reminders (active, next_fire)")
+    conn.execute('''CREATE TABLE IF NOT EXISTS reminder_notifications
+                    (id INTEGER PRIMARY KEY, reminder_id INTEGER, user_id TEXT, message TEXT,
+                     fired_at REAL, seen INTEGER DEFAULT 0)''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_reminder_notifications_unseen "
+                 "ON reminder_notifications (seen, user_id)")
+    conn.commit()
+
+
+def parse_rule(rule):
+    """Return the repeat interval in seconds for a recurrence rule, or None for one-off reminders."""
+    if not rule:
+        return None
+    if rule in RECURRENCE_PRESETS:
+        return RECURRENCE_PRESETS[rule]
+    match = _EVERY.match(rule)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Unsupported recurrence rule: {rule!r}")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+def next_occurrence(fired_at, interval, now):
+    """Next fire time strictly after `now`; occurrences missed while the server was down are skipped."""
+    if fired_at + interval > now:
+        return fired_at + interval
+    missed = int((now - fired_at) // interval)
+    return fired_at + (missed + 1) * interval
+
+
+# =======================
+# Scheduler
+# =======================
+class ReminderScheduler:
+    """Scheduler over the shared reminder tables, delivering reminders into per-user inboxes."""
+
+    def __init__(self, path=REMINDERS_DB_PATH, clock=time.time, start=True):
+        self.clock = clock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        apply_pragmas(self._conn)
+        self._db_lock = threading.Lock()
+        self._cond = threading.Condition()  # Wakes the scheduler thread early for reminders added here
+        self._stop = False
+        self._woken = False  # Set by add() so a wake-up between reading the next due time and waiting is not lost
+        self._thread = None
+        create_reminder_tables(self._conn)
+        if start:
+            self.start()
+
+    # -----------------------
+    # Public API
+    # -----------------------
+    def add(self, user_id, message, fire_at, rule=None):
+        """Schedule a reminder at epoch time `fire_at`, optionally recurring; returns its id."""
+        parse_rule(rule)  # Validate before storing
+        with self._db_lock, self._conn:
+            reminder_id = self._conn.execute(
+                "INSERT INTO reminders (user_id, message, next_fire, rule) VALUES (?, ?, ?, ?)",
+                (user_id, message, fire_at, rule)).lastrowid
+        with self._cond:
+            self._woken = True
+            self._cond.notify()  # The new reminder may be due before the current wait ends
+        return reminder_id
+
+    def cancel(self, reminder_id, user_id=None):
+        """Deactivate a reminder; returns False if it is not active (or not the user's)."""
+        query, params = "UPDATE reminders SET active = 0 WHERE id = ? AND active = 1", [reminder_id]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        with self._db_lock, self._conn:
+            return self._conn.execute(query, params).rowcount > 0
+
+    def upcoming(self, user_id):
+        """Active reminders for one user as (id, message, next_fire, rule), soonest first."""
+        with self._db_lock:
+            return self._conn.execute("SELECT id, message, next_fire, rule FROM reminders "
+                                      "WHERE user_id = ? AND active = 1 ORDER BY next_fire", (user_id,)).fetchall()
+
+    def notifications(self, user_id):
+        """Fired but unacknowledged notifications for a user as (id, message, fired_at), by any worker."""
+        with self._db_lock:
+            return self._conn.execute("SELECT id, message, fired_at FROM reminder_notifications "
+                                      "WHERE seen = 0 AND user_id = ? ORDER BY fired_at, id", (user_id,)).fetchall()
+
+    def acknowledge(self, user_id, notification_ids):
+        """Mark notifications as seen so they are not shown again, including after a restart."""
+        with self._db_lock, self._conn:
+            self._conn.executemany("UPDATE reminder_notifications SET seen = 1 WHERE id = ? AND user_id = ?",
+                                   [(i, user_id) for i in set(notification_ids)])
+
+    # -----------------------
+    # Firing
+    # -----------------------
+    def _next_due(self):
+        """Fire time of the earliest active reminder, or None."""
+        with self._db_lock:
+            return self._conn.execute("SELECT MIN(next_fire) FROM reminders WHERE active = 1").fetchone()[0]
+
+    def run_pending(self):
+        """Fire every reminder due at the current clock time; returns the number this scheduler fired."""
+        with self._db_lock:
+            due = self._conn.execute("SELECT id, user_id, message, next_fire, rule FROM reminders "
+                                     "WHERE active = 1 AND next_fire <= ? ORDER BY next_fire, id",
+                                     (self.clock(),)).fetchall()
+        return sum(self._fire(*row) for row in due)
+
+    def _fire(self, reminder_id, user_id, message, fire_at, rule):
+        """Claim one due reminder, deliver it and persist its next occurrence; returns 1 if this call fired it."""
+        now = self.clock()
+        interval = parse_rule(rule)
+        next_fire = next_occurrence(fire_at, interval, now) if interval else None
+        with self._db_lock, self._conn:
+            # Another worker that fired (or a cancel) has already changed the row: then it is not ours
+            claimed = self._conn.execute(
+                "UPDATE reminders SET next_fire = ?, active = ? WHERE id = ? AND active = 1 AND next_fire = ?",
+                (next_fire if next_fire is not None else fire_at, int(next_fire is not None), reminder_id,
+                 fire_at)).rowcount
+            if not claimed:
+                return 0
+            self._conn.execute(
+                "INSERT INTO reminder_notifications (reminder_id, user_id, message, fired_at) VALUES (?, ?, ?, ?)",
+                (reminder_id, user_id, message, now))
+        return 1
+
+    # -----------------------
+    # Lifecycle
+    # -----------------------
+    def start(self):
+        """Start the background scheduler thread."""
+        self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Sleep until the earliest reminder is due, fire it, repeat."""
+        while True:
+            try:
+                next_fire = self._next_due()
+                with self._cond:
+                    if self._stop:
+                        return
+                    if self._woken:
+                        self._woken = False
+                        continue  # Re-read the next due time, which may now be sooner
+                    # Bounded wait: reminders added by other workers are only seen on the next look
+                    delay = next_fire - self.clock() if next_fire is not None else MAX_IDLE_WAIT
+                    if delay > 0:
+                        self._cond.wait(min(delay, MAX_IDLE_WAIT))
+                        continue
+                self.run_pending()
+            except Exception as e:
+                logger.error(f"Error firing reminders: {str(e)}")
+                with self._cond:
+                    self._cond.wait(MAX_IDLE_WAIT)  # Back off instead of spinning on a broken database
+
+    def stop(self):
+        """Stop the scheduler thread and close its connection."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._conn.close()
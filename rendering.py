@@ -0,0 +1,141 @@
+# Homo Immortalis - Post Rendering
+# ================================
+# Description: Validation, sanitization and HTML rendering of community posts.
+# Posts are rendered once at insert time and the safe HTML is stored next to the raw
+# text together with RENDERER_VERSION, so the read path only emits cached HTML.
+# Bumping RENDERER_VERSION makes old rows re-render lazily the next time they are read.
+# Supported markup (a small, safe Markdown subset):
+# - Paragraphs separated by blank lines, single newlines as line breaks.
+# - "- " or "* " bullet lists, "# " headings.
+# - **bold**, *italic*, `code` and [text](https://link) with http(s) links only.
+
+import html  # HTML escaping of all user text
+import logging  # Logging for error handling and debugging
+import re  # Regular expressions for inline markup and validation
+
+logger = logging.getLogger(__name__)
+
+RENDERER_VERSION = 3  # Bump whenever render_post output changes
+MAX_POST_LENGTH = 5000  # Characters
+
+# Control characters other than tab and newline are never legitimate in a post
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_CODE = re.compile(r"`([^`\n]+)`")
+_BOLD_ITALIC = re.compile(r"\*\*\*(.+?)\*\*\*")
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_ITALIC = re.compile(r"(?<![\*\w])\*(?!\s)(.+?)(?<!\s)\*(?!\*)")
+_LINK = re.compile(r"\[([^\]\n]+)\]\((https?://[^\s()]+)\)")
+_BULLET = re.compile(r"^[-*] +")
+_EMPHASIS_TAG = re.compile(r"<(/?)(strong|em)>")
+
+
+# =======================
+# Validation
+# =======================
+def validate_post(text):
+    """Normalize a post and reject empty or oversized content with a ValueError."""
+    text = _CONTROL_CHARS.sub("", (text or "").replace("\r\n", "\n").replace("\r", "\n")).strip()
+    if not text:
+        raise ValueError("Post cannot be empty.")
+    if len(text) > MAX_POST_LENGTH:
+        raise ValueError(f"Post is too long ({len(text)} characters, maximum {MAX_POST_LENGTH}).")
+    return text
+
+
+# =======================
+# Rendering
+# =======================
+def _balanced(fragment):
+    """True if the emphasis tags in `fragment` open and close in properly nested pairs."""
+    stack = []
+    for closing, tag in _EMPHASIS_TAG.findall(fragment):
+        if not closing:
+            stack.append(tag)
+        elif not stack or stack.pop() != tag:
+            return False
+    return not stack
+
+
+def _emphasis(text):
+    """Bold/italic markup; the triple form first, and italics only around whole tags, so tags always nest."""
+    text = _BOLD_ITALIC.sub(r"<strong><em>\1</em></strong>", text)
+    text = _BOLD.sub(r"<strong>\1</strong>", text)
+    return _ITALIC.sub(lambda m: f"<em>{m.group(1)}</em>" if _balanced(m.group(1)) else m.group(0), text)
+
+
+def _render_inline(escaped):
+    """Apply inline markup to already-escaped text; code spans and link URLs are protected from other rules."""
+    stashed = []
+
+    def stash(rendered):
+        stashed.append(rendered)
+        return f"\x00{len(stashed) - 1}\x00"  # Control characters never survive validate_post
+
+    def link(match):
+        # Emphasis applies to the label only; an asterisk in the URL must stay an asterisk
+        return stash(f'<a href="{match.group(2)}" target="_blank" rel="nofollow noopener noreferrer">'
+                     f'{_emphasis(match.group(1))}</a>')
+
+    out = _CODE.sub(lambda m: stash(f"<code>{m.group(1)}</code>"), escaped)
+    out = _emphasis(_LINK.sub(link, out))
+
+    def restore(text):
+        return re.sub(r"\x00(\d+)\x00", lambda m: restore(stashed[int(m.group(1))]), text)
+
+    return restore(out)  # Recursive: a link label may hold a stashed code span
+
+
+def render_post(text):
+    """Render post text to safe HTML.
+
+    All text is HTML-escaped before any markup is applied, so user input can never
+    produce tags or attributes other than the ones emitted here.
+    """
+    blocks = []
+    for block in re.split(r"\n\s*\n", text.strip()):
+        lines = [line.strip() for line in block.split("\n") if line.strip()]
+        if not lines:
+            continue
+        if all(_BULLET.match(line) for line in lines):
+            items = "".join(f"<li>{_render_inline(html.escape(_BULLET.sub('', line)))}</li>" for line in lines)
+            blocks.append(f"<ul>{items}</ul>")
+        elif len(lines) == 1 and lines[0].startswith("# "):
+            blocks.append(f"<h4>{_render_inline(html.escape(lines[0][2:].strip()))}</h4>")
+        else:
+            blocks.append("<p>" + "<br>".join(_render_inline(html.escape(line)) for line in lines) + "</p>")
+    return "".join(blocks)
+
+
+def prepare_post(text):
+    """Validate a post and return (clean_text, html, renderer_version) ready to store."""
+    clean = validate_post(text)
+    return clean, render_post(clean), RENDERER_VERSION
+
+
+# =======================
+# Lazy Re-rendering
+# =======================
+def rerender_stale(conn, df, schema="main"):
+    """Re-render rows of a posts DataFrame whose stored HTML predates RENDERER_VERSION.
+
+    Updated HTML is written back to `schema`.posts so each row is re-rendered only once.
+    """
+    if df.empty:
+        return df
+    stale = df["render_version"].isna() | (df["render_version"] != RENDERER_VERSION)
+    if not stale.any():
+        return df
+    df = df.copy()
+    updates = []
+    for index in df.index[stale]:
+        rendered = render_post(df.at[index, "content"] or "")
+        df.at[index, "content_html"] = rendered
+        df.at[index, "render_version"] = RENDERER_VERSION
+        updates.append((rendered, RENDERER_VERSION, int(df.at[index, "id"])))
+    try:
+        with conn:
+            conn.executemany(f"UPDATE {schema}.posts SET content_html = ?, render_version = ? WHERE id = ?", updates)
+    except Exception as e:
+        # Serving the freshly rendered HTML matters more than caching it
+        logger.error(f"Error storing re-rendered posts: {str(e)}")
+    return df
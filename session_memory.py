@@ -0,0 +1,245 @@
+# Homo Immortalis - Session Memory
+# ================================
+# Description: Per-session memory accounting and idle-session state eviction.
+# Every browser tab holds its own st.session_state in server memory for as long as the
+# tab stays connected, idle or not. Each script run registers its session here; a
+# background sweeper measures every session's state per key, and moves heavy values of
+# sessions idle longer than `idle_seconds` (or, when the total exceeds the resident
+# budget, of the least recently active sessions) into pickles on disk. The next run of
+# an evicted session restores them before any page reads its state, so eviction is
+# invisible to the user. Widget-bound keys are never evicted; the browser owns those.
+# Sessions with a script run in progress are never measured or evicted, and idle time
+# counts from the end of the last run.
+
+import hashlib  # Reporting user ids as digests
+import logging  # Logging for error handling and debugging
+import os  # Spill directory
+import pickle  # Spilled state, matching Streamlit's own session-state serialization
+import threading  # Sweeper thread and registry locks
+import time  # Idle tracking
+import weakref  # Forget sessions Streamlit has closed
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx  # The running session
+from streamlit.vendor.pympler.asizeof import asizeof  # Deep object sizes, as Streamlit's own stats use
+
+logger = logging.getLogger(__name__)
+
+SPILL_DIR = os.environ.get("IMMORTALIS_SESSION_SPILL_DIR", os.path.join(".cache", "sessions"))
+IDLE_SECONDS = float(os.environ.get("IMMORTALIS_SESSION_IDLE_SECONDS", "900"))
+RESIDENT_BUDGET_BYTES = int(os.environ.get("IMMORTALIS_SESSION_BUDGET_MB", "256")) * 1024 * 1024
+MIN_SPILL_BYTES = 4096  # Smaller values cost more to spill and restore than they save
+MIN_IDLE_SECONDS = 60.0  # Even over budget, a session active this recently is left alone
+
+
+class _Session:
+    """Registry entry: a weak reference to one session's state plus its eviction bookkeeping."""
+
+    def __init__(self, session_id, state):
+        self.session_id = session_id
+        self.state = weakref.ref(state)
+        self.user_id = None
+        self.last_seen = time.time()
+        self.sizes = {}  # key -> bytes, as of the last measurement
+        self.spilled = {}  # key -> bytes, for values currently on disk
+        self.running = False  # A script run is in progress; its state must not be touched
+        self.wrapper = None  # Weak reference to the latest run's SafeSessionState, whose lock guards the state
+        self.lock = threading.Lock()
+
+    def target(self):
+        """The state to read and write: through the locking wrapper while it lives, else the raw state."""
+        wrapper = self.wrapper() if self.wrapper is not None else None
+        return wrapper if wrapper is not None else self.state()
+
+
+def _session_state(ctx):
+    """The session's SessionState; the SafeSessionState wrapper in `ctx` is rebuilt for every run."""
+    return getattr(ctx.session_state, "_state", ctx.session_state)
+
+
+def _is_widget_key(state, key):
+    """True if `key` belongs to a widget, whose value the frontend re-sends and owns."""
+    mapper = getattr(state, "_key_id_mapper", None)
+    return mapper is not None and key in mapper
+
+
+class SessionMemory:
+    """Process-wide registry of live sessions with accounting and spill-to-disk eviction."""
+
+    def __init__(self, spill_dir=SPILL_DIR, idle_seconds=IDLE_SECONDS, budget_bytes=RESIDENT_BUDGET_BYTES,
+                 min_spill_bytes=MIN_SPILL_BYTES):
+        self.spill_dir = spill_dir
+        self.idle_seconds = idle_seconds
+        self.budget_bytes = budget_bytes
+        self.min_spill_bytes = min_spill_bytes
+        self._sessions = {}  # session_id -> _Session
+        self._lock = threading.Lock()
+        os.makedirs(spill_dir, exist_ok=True)
+        for name in os.listdir(spill_dir):
+            path = os.path.join(spill_dir, name)
+            if name.endswith(".pkl") and os.path.getmtime(path) < time.time() - 86400:
+                os.remove(path)  # Left behind by a server that has since restarted
+
+    # =======================
+    # Script-run Hooks
+    # =======================
+    def track(self, user_id=None):
+        """Register the running session and restore any state evicted while it was idle."""
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return
+        with self._lock:
+            session = self._sessions.get(ctx.session_id)
+            if session is None or session.state() is None:
+                session = self._sessions[ctx.session_id] = _Session(ctx.session_id, _session_state(ctx))
+        with session.lock:  # Waits for an eviction of this session that is under way
+            session.running = True
+            session.last_seen = time.time()
+            session.wrapper = weakref.ref(ctx.session_state)
+            session.user_id = user_id or session.user_id
+            if session.spilled:
+                self._restore(session, ctx.session_state)
+
+    def finish(self):
+        """Mark the running session's script run as over; idle time counts from here."""
+        ctx = get_script_run_ctx()
+        session = self._sessions.get(ctx.session_id) if ctx is not None else None
+        if session is not None:
+            with session.lock:
+                session.running = False
+                session.last_seen = time.time()
+
+    def _path(self, session):
+        return os.path.join(self.spill_dir, f"{session.session_id}.pkl")
+
+    def _restore(self, session, state):
+        try:
+            with open(self._path(session), "rb") as f:
+                values = pickle.load(f)
+            for key, value in values.items():
+                if key not in state:  # Never overwrite anything set since the eviction
+                    state[key] = value
+            os.remove(self._path(session))
+        except (OSError, pickle.PickleError, EOFError) as e:
+            logger.error(f"Error restoring evicted session state: {str(e)}")
+        session.spilled = {}
+
+    # =======================
+    # Accounting
+    # =======================
+    def _live(self):
+        """Live sessions, dropping (and cleaning up after) those Streamlit has closed."""
+        with self._lock:
+            for session_id, session in list(self._sessions.items()):
+                if session.state() is None:
+                    del self._sessions[session_id]
+                    if os.path.exists(self._path(session)):
+                        os.remove(self._path(session))
+            return list(self._sessions.values())
+
+    def measure(self):
+        """Refresh per-key sizes of every live session's state."""
+        for session in self._live():
+            with session.lock:
+                state = session.target()
+                if state is None or session.running:
+                    continue  # A running script may be mutating its state; keep the last measurement
+                sizes = {}
+                for key, value in state.filtered_state.items():
+                    try:
+                        sizes[key] = asizeof(value)
+                    except Exception:
+                        sizes[key] = 0
+                session.sizes = sizes
+
+    def report(self):
+        """Per-session and total resident/spilled bytes, most memory-hungry sessions first."""
+        self.measure()
+        now = time.time()
+        sessions = [{
+            "session": session.session_id[:8],
+            # A uid is the only credential for a user's data, so only a short digest is reported
+            "user": hashlib.sha256(session.user_id.encode()).hexdigest()[:8] if session.user_id else None,
+            "idle_seconds": int(now - session.last_seen),
+            "keys": len(session.sizes),
+            "resident_bytes": sum(session.sizes.values()),
+            "spilled_bytes": sum(session.spilled.values()),
+            "largest": sorted(session.sizes.items(), key=lambda item: -item[1])[:3],
+        } for session in self._live()]
+        sessions.sort(key=lambda s: -s["resident_bytes"])
+        return {
+            "sessions": sessions,
+            "resident_bytes": sum(s["resident_bytes"] for s in sessions),
+            "spilled_bytes": sum(s["spilled_bytes"] for s in sessions),
+            "budget_bytes": self.budget_bytes,
+        }
+
+    # =======================
+    # Eviction
+    # =======================
+    def _spill(self, session, min_idle):
+        """Move a session's heavy, non-widget values to disk if it is still idle; returns bytes freed."""
+        with session.lock:
+            state = session.target()
+            if state is None or session.running or time.time() - session.last_seen < min_idle:
+                return 0  # The session came back while we were deciding
+            heavy = {key: size for key, size in session.sizes.items()
+                     if size >= self.min_spill_bytes and key not in session.spilled
+                     and not _is_widget_key(session.state(), key)}
+            values = {}
+            for key in heavy:
+                try:
+                    values[key] = state[key]
+                    pickle.dumps(values[key])
+                except Exception:
+                    values.pop(key, None)  # Unpicklable or already gone: keep it in memory
+            if not values:
+                return 0
+            if session.spilled:  # Add to what an earlier sweep already wrote
+                with open(self._path(session), "rb") as f:
+                    values = {**pickle.load(f), **values}
+            tmp = self._path(session) + ".tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(values, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(session))
+            freed = 0
+            for key in values:
+                if key not in session.spilled:
+                    del state[key]  # Under the session lock, so a new run waits for us in track()
+                    session.spilled[key] = heavy.get(key, 0)
+                    freed += session.sizes.pop(key, 0)
+            return freed
+
+    def sweep(self):
+        """Evict idle sessions, then the least recently active ones while over budget; returns bytes freed."""
+        self.measure()
+        now = time.time()
+        sessions = sorted(self._live(), key=lambda s: s.last_seen)
+        freed = 0
+        for session in sessions:
+            if now - session.last_seen >= self.idle_seconds:
+                freed += self._spill(session, self.idle_seconds)
+        resident = sum(sum(s.sizes.values()) for s in sessions)
+        for session in sessions:
+            if resident <= self.budget_bytes:
+                break
+            if now - session.last_seen >= MIN_IDLE_SECONDS:
+                released = self._spill(session, MIN_IDLE_SECONDS)
+                resident -= released
+                freed += released
+        if freed:
+            logger.info(f"Evicted {freed / 1024:.0f} KB of idle session state to disk; {resident / 1024:.0f} KB resident.")
+        return freed
+
+    def start_sweeper(self, interval_seconds=60.0):
+        """Sweep every `interval_seconds` in a daemon thread; returns a stop Event."""
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval_seconds):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logger.error(f"Error evicting session state: {str(e)}")
+
+        threading.Thread(target=run, name="session-sweeper", daemon=True).start()
+        return stop
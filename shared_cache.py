@@ -0,0 +1,283 @@
+# Homo Immortalis - Shared Cache
+# ==============================
+# Description: Cross-process cache for multi-worker deployments.
+# `st.cache_data` / `st.cache_resource` live inside one Streamlit process, so several
+# server processes behind a load balancer each fetch and compute the same things.
+# SharedCache stores pickled values in a local SQLite file (WAL mode, no external
+# service) that every process on the host opens, with:
+# - Per-entry TTLs.
+# - Entry-count and total-size limits, evicting expired then least recently used entries.
+# - A single-flight lock per key, so only one process recomputes an expired entry while
+#   the others wait for its result.
+# - Named leases and run_periodic(), so background jobs started by every worker (index
+#   rebuilds, maintenance, backups) run in one process at a time, once per interval.
+# - Named timestamps ("marks": a job's last run, the last app activity) in their own table,
+#   outside the TTL and size eviction, so cache pressure never makes every job due again.
+# Usage:
+#     @shared_cache(ttl=600)
+#     def expensive(arg): ...
+
+import functools  # Decorator wrapping
+import hashlib  # Stable cache keys from call arguments
+import logging  # Logging for error handling and debugging
+import os  # Cache location, process id
+import pickle  # Value serialization
+import socket  # Host name for lock owners
+import sqlite3  # Shared storage
+import threading  # Per-thread connections
+import time  # TTLs, lock leases and polling
+import uuid  # Unique lock owner tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.environ.get("IMMORTALIS_SHARED_CACHE", os.path.join(".cache", "shared_cache.db"))
+TOUCH_INTERVAL = 30.0  # Seconds between last-access updates for one entry, to keep reads mostly read-only
+
+
+class SharedCache:
+    """SQLite-backed key/value cache shared by every process that opens the same file."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=1000, max_bytes=64 * 1024 * 1024,
+                 lock_timeout=60.0, poll_interval=0.05, clock=time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock_timeout = lock_timeout  # Lease on a recompute lock; also the longest a waiter waits
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS cache_entries
+                            (key TEXT PRIMARY KEY, value BLOB, size INTEGER, expires_at REAL, last_access REAL)''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_access ON cache_entries (last_access)")
+            conn.execute('''CREATE TABLE IF NOT EXISTS cache_locks
+                            (key TEXT PRIMARY KEY, owner TEXT, expires_at REAL)''')
+            conn.execute('''CREATE TABLE IF NOT EXISTS cache_marks
+                            (name TEXT PRIMARY KEY, at REAL)''')
+
+    def _conn(self):
+        """One connection per thread; WAL lets readers in other processes proceed during writes."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -----------------------
+    # Basic operations
+    # -----------------------
+    def get(self, key):
+        """Return (True, value) for a live entry, else (False, None)."""
+        now = self.clock()
+        conn = self._conn()
+        row = conn.execute("SELECT value, expires_at, last_access FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= now:
+            return False, None
+        if now - row[2] >= TOUCH_INTERVAL:
+            with conn:
+                conn.execute("UPDATE cache_entries SET last_access = ? WHERE key = ?", (now, key))
+        try:
+            return True, pickle.loads(row[0])
+        except Exception as e:
+            logger.error(f"Error loading shared cache entry {key}: {str(e)}")
+            return False, None
+
+    def set(self, key, value, ttl):
+        """Store a value for `ttl` seconds, then enforce the size limits."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            logger.warning(f"Not caching {key}: {len(blob)} bytes exceeds the cache size limit.")
+            return
+        now = self.clock()
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO cache_entries (key, value, size, expires_at, last_access) "
+                         "VALUES (?, ?, ?, ?, ?)", (key, blob, len(blob), now + ttl, now))
+            self._evict(conn, now)
+
+    def delete(self, key):
+        """Remove one entry."""
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix):
+        """Remove every entry whose key starts with `prefix:` (e.g. all results of one function)."""
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix) + 1, prefix + ":"))
+
+    def _evict(self, conn, now):
+        """Drop expired entries, then least recently used ones until within both limits."""
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        removed = 0
+        for key, size in conn.execute("SELECT key, size FROM cache_entries ORDER BY last_access").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            count, total, removed = count - 1, total - size, removed + 1
+        logger.info(f"Evicted {removed} shared cache entries.")
+
+    # -----------------------
+    # Single-flight
+    # -----------------------
+    def _acquire(self, key, owner, lease=None):
+        """Try to take the lock for `key`; expired leases from dead processes are taken over."""
+        now = self.clock()
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM cache_locks WHERE key = ? AND expires_at <= ?", (key, now))
+            cursor = conn.execute("INSERT OR IGNORE INTO cache_locks (key, owner, expires_at) VALUES (?, ?, ?)",
+                                  (key, owner, now + (lease or self.lock_timeout)))
+        return cursor.rowcount == 1
+
+    def _release(self, key, owner):
+        """Release the recompute lock if we still hold it."""
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM cache_locks WHERE key = ? AND owner = ?", (key, owner))
+
+    def get_or_compute(self, key, compute, ttl):
+        """Return the cached value for `key`, computing it in at most one process at a time.
+
+        Processes that lose the race poll until the winner stores the value. If the
+        winner fails or the lease runs out, a waiter takes over the lock and computes.
+        """
+        hit, value = self.get(key)
+        if hit:
+            return value
+        owner = _owner_token()
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            if self._acquire(key, owner):
+                try:
+                    hit, value = self.get(key)  # Another process may have finished just before we locked
+                    if not hit:
+                        value = compute()
+                        self.set(key, value, ttl)
+                    return value
+                finally:
+                    self._release(key, owner)
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting for shared cache key {key}; computing locally.")
+                return compute()
+            time.sleep(self.poll_interval)
+            hit, value = self.get(key)
+            if hit:
+                return value
+
+    # -----------------------
+    # Marks
+    # -----------------------
+    def mark(self, name, at=None):
+        """Record a named timestamp (default: now); marks are bookkeeping and never evicted."""
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO cache_marks (name, at) VALUES (?, ?)",
+                         (name, self.clock() if at is None else at))
+
+    def last_mark(self, name):
+        """The timestamp recorded for `name`, or None if it was never marked."""
+        row = self._conn().execute("SELECT at FROM cache_marks WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    # -----------------------
+    # Leases
+    # -----------------------
+    def try_lease(self, name, seconds):
+        """Take the cross-process lease `name` for `seconds`; returns an owner token, or None if held elsewhere.
+
+        A holder that dies simply lets the lease run out, so `seconds` should comfortably
+        exceed the work done under it.
+        """
+        owner = _owner_token()
+        return owner if self._acquire(f"lease:{name}", owner, seconds) else None
+
+    def release_lease(self, name, owner):
+        """Give up a lease taken with try_lease (a no-op if it has expired and been taken over)."""
+        self._release(f"lease:{name}", owner)
+
+
+def _owner_token():
+    """Unique lock owner id; host and pid make held locks attributable when debugging."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """Process-wide SharedCache at DEFAULT_CACHE_PATH, created on first use."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SharedCache()
+        return _default_cache
+
+
+def shared_cache(ttl, name=None, cache=None):
+    """Decorator caching a function's result across processes, keyed on its arguments.
+
+    Arguments must have a stable repr(); results must be picklable. A drop-in for
+    `st.cache_data(ttl=...)` on functions whose results should be shared by workers.
+    """
+    def decorator(func):
+        prefix = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            digest = hashlib.sha256(repr((args, sorted(kwargs.items()))).encode()).hexdigest()[:32]
+            return (cache or get_shared_cache()).get_or_compute(f"{prefix}:{digest}",
+                                                                lambda: func(*args, **kwargs), ttl)
+
+        wrapper.clear = lambda: (cache or get_shared_cache()).delete_prefix(prefix)
+        return wrapper
+    return decorator
+
+
+def run_periodic(name, interval_seconds, job, check_seconds=60.0, lease_seconds=3600.0, ready=None, force=None,
+                 cache=None):
+    """Run `job()` about once per `interval_seconds` across all processes sharing the cache.
+
+    Every worker may start this; at each check the first process to find the job due
+    (by the shared last-run time) and to take its lease runs it, so N workers still
+    produce one run per interval. `ready()` can hold a due run back (e.g. while traffic
+    is high) and `force()` can start one early. Runs in a daemon thread; returns a stop Event.
+    """
+    stop = threading.Event()
+    last_key = f"job:{name}:last_run"
+
+    def due(shared):
+        last = shared.last_mark(last_key)
+        return last is None or time.time() - last >= interval_seconds or bool(force and force())
+
+    def run():
+        shared = cache or get_shared_cache()
+        while not stop.wait(check_seconds):
+            try:
+                if not due(shared) or (ready and not ready()):
+                    continue
+                owner = shared.try_lease(f"job:{name}", lease_seconds)
+                if owner is None:
+                    continue  # Another process is running it
+                try:
+                    if due(shared):  # It may have finished elsewhere just before we took the lease
+                        job()
+                finally:
+                    # Recorded even after a failure, so a broken job is retried once per interval, not per check
+                    shared.mark(last_key, time.time())
+                    shared.release_lease(f"job:{name}", owner)
+            except Exception as e:
+                logger.error(f"Error running periodic job {name}: {str(e)}")
+
+    threading.Thread(target=run, name=f"periodic-{name}", daemon=True).start()
+    return stop
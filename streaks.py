@@ -0,0 +1,125 @@
+# Homo Immortalis - Activity Streaks
+# ==================================
+# Description: Persistent daily-activity tracking for Challenges and evolution levels.
+# Each user's activity is a bitmap per calendar year (one bit per day, 46 bytes a year),
+# and the current/longest streak and level are maintained incrementally on every log, so
+# logging twice on the same day counts once and streak checks and leaderboard queries are
+# single indexed lookups rather than scans of a user's history.
+
+import logging  # Logging for error handling and debugging
+from collections import namedtuple  # Lightweight streak records
+from datetime import date, timedelta  # Day arithmetic
+
+logger = logging.getLogger(__name__)
+
+BITMAP_BYTES = 46  # ceil(366 / 8)
+# Evolution levels by longest streak reached (days); levels are never lost
+LEVELS = [(0, "Homo Sapiens"), (7, "Homo Evolutis"), (100, "Homo Immortalis")]
+
+Streak = namedtuple("Streak", ["current", "longest", "last_day", "level"])
+
+
+def create_streak_tables(conn):
+    """Create the activity bitmap and streak tables if missing."""
+    conn.execute('''CREATE TABLE IF NOT EXISTS activity_bitmaps
+                    (user_id TEXT, year INTEGER, bits BLOB, PRIMARY KEY (user_id, year)) WITHOUT ROWID''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS user_streaks
+                    (user_id TEXT PRIMARY KEY, current INTEGER, longest INTEGER, last_day INTEGER, level TEXT)''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_user_streaks_longest ON user_streaks (longest DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_user_streaks_current ON user_streaks (current DESC)")
+    conn.commit()
+
+
+def level_for(longest):
+    """Evolution level reached with a given longest streak."""
+    return [name for threshold, name in LEVELS if longest >= threshold][-1]
+
+
+def _bit(day):
+    """(byte index, bit mask) of a day inside its year's bitmap."""
+    index = day.timetuple().tm_yday - 1
+    return index >> 3, 1 << (index & 7)
+
+
+# =======================
+# Recording Activity
+# =======================
+def record_activity(conn, user_id, day=None):
+    """Mark `day` (default today) active and update the streak; returns (Streak, newly_recorded)."""
+    day = day or date.today()
+    ordinal = day.toordinal()
+    byte, mask = _bit(day)
+    with conn:
+        row = conn.execute("SELECT bits FROM activity_bitmaps WHERE user_id = ? AND year = ?",
+                           (user_id, day.year)).fetchone()
+        bits = bytearray(row[0]) if row else bytearray(BITMAP_BYTES)
+        if bits[byte] & mask:
+            return get_streak(conn, user_id, day), False  # Already counted today
+        bits[byte] |= mask
+        conn.execute("INSERT OR REPLACE INTO activity_bitmaps (user_id, year, bits) VALUES (?, ?, ?)",
+                     (user_id, day.year, bytes(bits)))
+        row = conn.execute("SELECT current, longest, last_day FROM user_streaks WHERE user_id = ?",
+                           (user_id,)).fetchone()
+        current, longest, last_day = row if row else (0, 0, None)
+        if last_day is None or ordinal > last_day + 1:
+            current, last_day = 1, ordinal
+        elif ordinal == last_day + 1:
+            current, last_day = current + 1, ordinal
+        # Back-filled past days are kept in the bitmap but do not change the running streak
+        longest = max(longest, current)
+        level = level_for(longest)
+        conn.execute("INSERT OR REPLACE INTO user_streaks (user_id, current, longest, last_day, level) "
+                     "VALUES (?, ?, ?, ?, ?)", (user_id, current, longest, last_day, level))
+    return Streak(_live_current(current, last_day, max(ordinal, last_day)), longest, date.fromordinal(last_day), level), True
+
+
+# =======================
+# Queries
+# =======================
+def _live_current(current, last_day, today_ordinal):
+    """A streak is still alive if the last active day is today or yesterday."""
+    return current if last_day is not None and last_day >= today_ordinal - 1 else 0
+
+
+def get_streak(conn, user_id, today=None):
+    """Current streak, longest streak, last active day and level for one user."""
+    today = today or date.today()
+    row = conn.execute("SELECT current, longest, last_day, level FROM user_streaks WHERE user_id = ?",
+                       (user_id,)).fetchone()
+    if row is None:
+        return Streak(0, 0, None, level_for(0))
+    current, longest, last_day, level = row
+    return Streak(_live_current(current, last_day, today.toordinal()), longest, date.fromordinal(last_day), level)
+
+
+def is_active(conn, user_id, day):
+    """True if the user logged activity on `day`."""
+    row = conn.execute("SELECT bits FROM activity_bitmaps WHERE user_id = ? AND year = ?",
+                       (user_id, day.year)).fetchone()
+    byte, mask = _bit(day)
+    return bool(row and row[0][byte] & mask)
+
+
+def active_days(conn, user_id, year):
+    """All active days of one year, decoded from the bitmap."""
+    row = conn.execute("SELECT bits FROM activity_bitmaps WHERE user_id = ? AND year = ?",
+                       (user_id, year)).fetchone()
+    if row is None:
+        return []
+    start = date(year, 1, 1)
+    return [start + timedelta(days=i * 8 + b) for i, value in enumerate(row[0]) for b in range(8)
+            if value >> b & 1 and (start + timedelta(days=i * 8 + b)).year == year]
+
+
+def leaderboard(conn, limit=10, by="longest", today=None):
+    """Top users as (user_id, current, longest, level), by longest or by current (still alive) streak."""
+    today = today or date.today()
+    if by == "current":
+        rows = conn.execute("SELECT user_id, current, longest, last_day, level FROM user_streaks "
+                            "WHERE last_day >= ? ORDER BY current DESC LIMIT ?",
+                            (today.toordinal() - 1, limit)).fetchall()
+    else:
+        rows = conn.execute("SELECT user_id, current, longest, last_day, level FROM user_streaks "
+                            "ORDER BY longest DESC LIMIT ?", (limit,)).fetchall()
+    return [(user_id, _live_current(current, last_day, today.toordinal()), longest, level)
+            for user_id, current, longest, last_day, level in rows]
@@ -0,0 +1,219 @@
+# Homo Immortalis - Reminder Scheduler Tests
+# ==========================================
+# Description: Drives ReminderScheduler with a fake clock and a temporary database.
+# Apart from one real-time check, the background thread is never started: run_pending()
+# fires whatever is due at the fake time, so the tests are deterministic. Several
+# schedulers on one database stand in for several worker processes.
+# Usage: python -m pytest tests
+
+import os  # Repository root on the import path
+import sys  # Repository root on the import path
+import time  # Real clock for the background thread test
+
+import pytest  # Test runner and fixtures
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reminders import ReminderScheduler, next_occurrence, parse_rule  # noqa: E402
+
+START = 1_700_000_000.0  # Fake epoch time the tests start at
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self, now=START):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "reminders.db")
+
+
+@pytest.fixture
+def scheduler(db_path, clock):
+    scheduler = ReminderScheduler(db_path, clock=clock, start=False)
+    yield scheduler
+    scheduler.stop()
+
+
+def _messages(scheduler, user_id):
+    return [message for _, message, _ in scheduler.notifications(user_id)]
+
+
+# =======================
+# Recurrence Rules
+# =======================
+def test_parse_rule():
+    assert parse_rule(None) is None
+    assert parse_rule("daily") == 86400
+    assert parse_rule("every:90m") == 5400
+    for rule in ("monthly", "every:0h", "every:5s"):
+        with pytest.raises(ValueError):
+            parse_rule(rule)
+
+
+def test_next_occurrence_skips_missed():
+    assert next_occurrence(100.0, 10.0, 105.0) == 110.0
+    assert next_occurrence(100.0, 10.0, 110.0) == 120.0  # Strictly after now
+    assert next_occurrence(100.0, 10.0, 135.0) == 140.0
+
+
+# =======================
+# Firing
+# =======================
+def test_one_off_fires_once(scheduler, clock):
+    reminder_id = scheduler.add("u1", "Take magnesium", START + 60)
+    clock.advance(59)
+    assert scheduler.run_pending() == 0
+    clock.advance(1)
+    assert scheduler.run_pending() == 1
+    assert _messages(scheduler, "u1") == ["Take magnesium"]
+    assert scheduler.upcoming("u1") == []
+    clock.advance(86400)
+    assert scheduler.run_pending() == 0
+    assert not scheduler.cancel(reminder_id)  # No longer active
+
+
+def test_recurring_fires_each_interval(scheduler, clock):
+    scheduler.add("u1", "Zone 2 session", START + 3600, rule="hourly")
+    for hour in range(1, 4):
+        clock.now = START + hour * 3600
+        assert scheduler.run_pending() == 1
+    assert _messages(scheduler, "u1") == ["Zone 2 session"] * 3
+    [(_, _, next_fire, rule)] = scheduler.upcoming("u1")
+    assert (next_fire, rule) == (START + 4 * 3600, "hourly")
+
+
+def test_recurring_skips_missed_occurrences(scheduler, clock):
+    scheduler.add("u1", "Log sleep", START + 86400, rule="daily")
+    clock.now = START + 86400 * 4 + 100  # Down for three extra days
+    assert scheduler.run_pending() == 1  # One catch-up notification, not four
+    assert _messages(scheduler, "u1") == ["Log sleep"]
+    [(_, _, next_fire, _)] = scheduler.upcoming("u1")
+    assert next_fire == START + 86400 * 5
+
+
+def test_fires_in_time_order_per_user(scheduler, clock):
+    scheduler.add("u1", "second", START + 20)
+    scheduler.add("u2", "other user", START + 15)
+    scheduler.add("u1", "first", START + 10)
+    clock.advance(30)
+    assert scheduler.run_pending() == 3
+    assert _messages(scheduler, "u1") == ["first", "second"]
+    assert _messages(scheduler, "u2") == ["other user"]
+
+
+def test_cancel(scheduler, clock):
+    one_off = scheduler.add("u1", "one-off", START + 10)
+    recurring = scheduler.add("u1", "recurring", START + 10, rule="every:5m")
+    assert not scheduler.cancel(one_off, user_id="someone-else")
+    assert scheduler.cancel(one_off, user_id="u1")
+    assert scheduler.cancel(recurring)
+    assert not scheduler.cancel(recurring)
+    clock.advance(3600)
+    assert scheduler.run_pending() == 0
+    assert scheduler.notifications("u1") == []
+    assert scheduler.upcoming("u1") == []
+
+
+def test_acknowledge(scheduler, clock):
+    scheduler.add("u1", "a", START + 1)
+    scheduler.add("u1", "b", START + 2)
+    clock.advance(5)
+    scheduler.run_pending()
+    first_id = scheduler.notifications("u1")[0][0]
+    scheduler.acknowledge("u1", [first_id])
+    assert _messages(scheduler, "u1") == ["b"]
+
+
+# =======================
+# Persistence
+# =======================
+def test_schedule_and_inbox_survive_restart(db_path, clock):
+    scheduler = ReminderScheduler(db_path, clock=clock, start=False)
+    scheduler.add("u1", "one-off", START + 100)
+    scheduler.add("u1", "daily", START + 50, rule="daily")
+    cancelled = scheduler.add("u1", "cancelled", START + 50)
+    scheduler.cancel(cancelled)
+    clock.advance(60)
+    assert scheduler.run_pending() == 1  # "daily" fired before the restart
+    acknowledged = scheduler.add("u1", "acknowledged", START + 70)
+    clock.advance(20)
+    scheduler.run_pending()
+    scheduler.acknowledge("u1", [n for n, message, _ in scheduler.notifications("u1") if message == "acknowledged"])
+    scheduler.stop()
+
+    clock.now = START + 86400 + 100  # Restarted a day later
+    restarted = ReminderScheduler(db_path, clock=clock, start=False)
+    try:
+        assert _messages(restarted, "u1") == ["daily"]  # Unseen notifications are reloaded
+        assert [message for _, message, _, _ in restarted.upcoming("u1")] == ["one-off", "daily"]
+        assert not restarted.cancel(acknowledged)  # Fired once before the restart, so inactive
+        assert restarted.run_pending() == 2
+        assert _messages(restarted, "u1") == ["daily", "one-off", "daily"]
+        [(_, message, next_fire, _)] = restarted.upcoming("u1")
+        assert (message, next_fire) == ("daily", START + 2 * 86400 + 50)
+    finally:
+        restarted.stop()
+
+
+# =======================
+# Several Workers
+# =======================
+def test_workers_share_reminders_and_fire_once(db_path, clock):
+    workers = [ReminderScheduler(db_path, clock=clock, start=False) for _ in range(3)]
+    try:
+        first, second, third = workers
+        first.add("u1", "one-off", START + 10)
+        first.add("u1", "daily", START + 10, rule="daily")
+        cancelled = first.add("u1", "cancelled", START + 10)
+        assert second.cancel(cancelled, user_id="u1")  # Cancelled through another worker
+        clock.advance(60)
+        assert sum(worker.run_pending() for worker in workers) == 2  # Each reminder fired by one worker only
+        assert all(worker.run_pending() == 0 for worker in workers)
+        assert sorted(_messages(third, "u1")) == ["daily", "one-off"]  # Inbox visible from every worker
+        third.acknowledge("u1", [n for n, _, _ in third.notifications("u1")])
+        assert first.notifications("u1") == []
+        [(_, _, next_fire, _)] = second.upcoming("u1")
+        assert next_fire == START + 10 + 86400
+    finally:
+        for worker in workers:
+            worker.stop()
+
+
+def test_claimed_row_is_not_fired_again(scheduler, db_path, clock):
+    reminder_id = scheduler.add("u1", "hourly", START + 10, rule="hourly")
+    clock.advance(20)
+    other = ReminderScheduler(db_path, clock=clock, start=False)
+    try:
+        assert other.run_pending() == 1
+        # A worker holding the row as read before the other fired it fails to claim it
+        assert scheduler._fire(reminder_id, "u1", "hourly", START + 10, "hourly") == 0
+        assert _messages(scheduler, "u1") == ["hourly"]
+    finally:
+        other.stop()
+
+
+def test_background_thread_fires(db_path):
+    scheduler = ReminderScheduler(db_path)
+    try:
+        scheduler.add("u1", "now", time.time() + 0.2)
+        deadline = time.time() + 5
+        while not scheduler.notifications("u1") and time.time() < deadline:
+            time.sleep(0.05)
+        assert _messages(scheduler, "u1") == ["now"]
+    finally:
+        scheduler.stop()
@@ -0,0 +1,238 @@
+# Homo Immortalis - Post Throttling
+# =================================
+# Description: In-memory admission control for the community post path.
+# Every submission passes a PostGuard before it reaches SQLite: per-user, per-client-IP
+# and global token buckets cap the write rate, empty and recently repeated posts are rejected, and
+# when recent writes get slow (lock contention, a struggling disk) the guard switches
+# the Community page to read-only for a cool-down period instead of queueing more
+# writers behind the database lock. One guard is shared by all sessions of a process.
+# The user id comes from the URL and costs nothing to change, so the per-IP bucket is
+# what actually limits one client; it is looser, since several users can share an IP.
+# Behind a reverse proxy or load balancer the connection's address is the proxy's, so
+# the client address is taken from X-Forwarded-For, but only when the connection comes
+# from a trusted proxy: loopback (where Streamlit reports no IP) or an address in
+# IMMORTALIS_TRUSTED_PROXIES (comma-separated IPs/CIDRs). A proxy on another host must
+# be listed there, or every user shares its single IP bucket.
+
+import hashlib  # Duplicate detection without keeping post text
+import ipaddress  # Grouping IPv6 clients by /64
+import logging  # Logging for error handling and debugging
+import os  # Trusted proxy configuration
+import sqlite3  # Lock errors count as slow writes
+import statistics  # Median write latency
+import threading  # Guarding shared buckets
+import time  # Monotonic clock for refills and cool-downs
+from collections import OrderedDict, deque  # LRU maps and the latency window
+
+from rendering import validate_post
+
+logger = logging.getLogger(__name__)
+
+TRUSTED_PROXIES = [ipaddress.ip_network(net.strip(), strict=False)
+                   for net in os.environ.get("IMMORTALIS_TRUSTED_PROXIES", "").split(",") if net.strip()]
+
+
+class PostRejected(ValueError):
+    """Raised when a submission is throttled, duplicated or arrives while posting is paused."""
+
+
+# =======================
+# Token Bucket
+# =======================
+class TokenBucket:
+    """Holds up to `capacity` tokens, refilled continuously at `rate` tokens per second."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, n=1):
+        """Take `n` tokens if available; returns False (taking none) otherwise."""
+        self._refill()
+        if self.tokens < n:
+            return False
+        self.tokens -= n
+        return True
+
+    def give_back(self, n=1):
+        """Return tokens taken for a submission that was rejected further along."""
+        self.tokens = min(self.capacity, self.tokens + n)
+
+    def retry_after(self, n=1):
+        """Seconds until `n` tokens will be available."""
+        self._refill()
+        return max(0.0, (n - self.tokens) / self.rate)
+
+
+# =======================
+# Post Guard
+# =======================
+def _trusted(address, trusted):
+    """True for loopback (and unknown, i.e. local) peers and addresses in the trusted proxy networks."""
+    if not address:
+        return True  # Streamlit reports no IP for localhost connections
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return ip.is_loopback or any(ip in net for net in trusted)
+
+
+def client_address(remote_ip, headers=None, trusted=None):
+    """The client's IP: the connection's, or from X-Forwarded-For when the connection is a trusted proxy.
+
+    X-Forwarded-For is read right to left, skipping trusted proxies, since entries to the
+    left of the first untrusted one are whatever the client chose to send.
+    """
+    trusted = TRUSTED_PROXIES if trusted is None else trusted
+    if not _trusted(remote_ip, trusted):
+        return remote_ip
+    forwarded = (headers or {}).get("X-Forwarded-For")
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()] if forwarded else []
+    for hop in reversed(hops):
+        if not _trusted(hop, trusted):
+            return hop
+    return hops[0] if hops else remote_ip
+
+
+def client_key(ip_address):
+    """Rate-limit key for a client IP; IPv6 clients are grouped by /64, which one host usually holds whole."""
+    if not ip_address:
+        return None  # Local connections have no IP
+    try:
+        address = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return ip_address
+    if address.version == 6:
+        if address.ipv4_mapped is not None:
+            return str(address.ipv4_mapped)
+        return str(ipaddress.ip_network(f"{address}/64", strict=False))
+    return str(address)
+
+
+class PostGuard:
+    """Rate limits, duplicate rejection and automatic read-only mode for post writes.
+
+    Defaults allow a burst of 3 posts and then one post every 20 seconds per user, a
+    burst of 10 and then one every 5 seconds per client IP, and 5 posts per second
+    across all users (bursts of 20). If the median of the last
+    `latency_window` writes exceeds `latency_threshold_ms`, or a write fails on a locked
+    database, posting is paused for `cooldown` seconds.
+    """
+
+    def __init__(self, user_rate=1 / 20, user_burst=3, ip_rate=1 / 5, ip_burst=10, global_rate=5.0, global_burst=20,
+                 duplicate_window=600.0, latency_threshold_ms=500.0, latency_window=20, cooldown=60.0,
+                 max_users=10000, clock=time.monotonic):
+        self.user_rate, self.user_burst = user_rate, user_burst
+        self.ip_rate, self.ip_burst = ip_rate, ip_burst
+        self.duplicate_window = duplicate_window
+        self.latency_threshold_ms = latency_threshold_ms
+        self.cooldown = cooldown
+        self.max_users = max_users
+        self.clock = clock
+        self.global_bucket = TokenBucket(global_rate, global_burst, clock)
+        self.latencies = deque(maxlen=latency_window)
+        self.paused_until = None
+        self._users = OrderedDict()  # ("user", user_id) / ("ip", client key) -> TokenBucket, least recently active first
+        self._recent = OrderedDict()  # (user_id, content hash) -> submitted at; oldest first
+        self._lock = threading.Lock()
+
+    @property
+    def read_only(self):
+        """True while posting is paused because writes were slow."""
+        with self._lock:
+            if self.paused_until is not None and self.clock() >= self.paused_until:
+                self.paused_until = None
+                self.latencies.clear()  # Judge the recovered database on fresh writes only
+                logger.info("Community posting resumed.")
+            return self.paused_until is not None
+
+    def resume_in(self):
+        """Seconds left in the current read-only period (0 when posting is open)."""
+        with self._lock:
+            return max(0.0, self.paused_until - self.clock()) if self.paused_until is not None else 0.0
+
+    def _bucket(self, key, rate, burst):
+        bucket = self._users.pop(key, None)
+        if bucket is None:
+            bucket = TokenBucket(rate, burst, self.clock)
+            if len(self._users) >= self.max_users:
+                self._users.popitem(last=False)  # A forgotten user starts again with a full bucket
+        self._users[key] = bucket
+        return bucket
+
+    @staticmethod
+    def _key(user_id, text, scope=None):
+        """Duplicate-detection key: the user, where they posted, and a hash of the whitespace/case-folded text."""
+        return user_id, scope, hashlib.sha256(" ".join(text.lower().split()).encode()).hexdigest()
+
+    def admit(self, user_id, content, ip_address=None, scope=None):
+        """Check a submission before any database work; returns the normalized text.
+
+        Raises ValueError for empty/oversized posts and PostRejected when throttled,
+        duplicated or paused. `ip_address` is the client's, as resolved by client_address().
+        `scope` separates duplicate detection, e.g. per post for replies, so the same
+        short reply may go to different posts.
+        """
+        text = validate_post(content)
+        if self.read_only:
+            raise PostRejected("Posting is temporarily paused while the community is busy. Please try again shortly.")
+        key = self._key(user_id, text, scope)
+        with self._lock:
+            now = self.clock()
+            while self._recent and next(iter(self._recent.values())) < now - self.duplicate_window:
+                self._recent.popitem(last=False)
+            if key in self._recent:
+                raise PostRejected("You already posted this.")
+            client = client_key(ip_address)
+            buckets = [self._bucket(("user", user_id), self.user_rate, self.user_burst)]
+            if client is not None:
+                buckets.append(self._bucket(("ip", client), self.ip_rate, self.ip_burst))
+            taken = []
+            for bucket in buckets:
+                if not bucket.take():
+                    for held in taken:
+                        held.give_back()
+                    raise PostRejected(f"You're posting too fast. Try again in {int(bucket.retry_after()) + 1} seconds.")
+                taken.append(bucket)
+            if not self.global_bucket.take():
+                for held in taken:
+                    held.give_back()
+                raise PostRejected("The community is receiving a lot of posts. Please try again in a moment.")
+            self._recent[key] = now
+        return text
+
+    def record_write(self, seconds, failed=False):
+        """Feed a write's latency (or a lock failure) into the read-only switch."""
+        with self._lock:
+            self.latencies.append(float("inf") if failed else seconds * 1000)
+            slow = failed or (len(self.latencies) >= min(5, self.latencies.maxlen)
+                              and statistics.median(self.latencies) > self.latency_threshold_ms)
+            if slow and self.paused_until is None:
+                self.paused_until = self.clock() + self.cooldown
+                logger.warning(f"Community posting paused for {self.cooldown:.0f}s: slow writes "
+                               f"(median {statistics.median(self.latencies):.0f} ms).")
+
+    def submit(self, user_id, content, write, ip_address=None, scope=None):
+        """Admit a submission, run `write(text)` timed, and return its result."""
+        text = self.admit(user_id, content, ip_address, scope)
+        start = time.perf_counter()
+        try:
+            result = write(text)
+        except Exception as e:
+            with self._lock:
+                self._recent.pop(self._key(user_id, text, scope), None)  # A failed post may be retried as-is
+            if isinstance(e, sqlite3.OperationalError) and "locked" in str(e):
+                self.record_write(time.perf_counter() - start, failed=True)
+                raise PostRejected("The community is busy right now. Please try again shortly.") from e
+            raise
+        self.record_write(time.perf_counter() - start)
+        return result
@@ -0,0 +1,340 @@
+# Homo Immortalis - Wearable Data Import
+# ======================================
+# Description: Streaming import of wearable exports into the biomarker store.
+# Apple Health exports (export.xml, or the export.zip containing it, often several GB)
+# are parsed incrementally with iterparse and cleared as they go; Oura and Garmin CSVs
+# are read in chunks. Samples are folded into per-day aggregates for the app's sleep,
+# exercise and biomarker fields and bulk-upserted into the `biomarkers` table in large
+# transactions, so memory stays bounded by (days x metrics) rather than by file size.
+# Usable from the Notebook upload widget and from the command line:
+#     python wearables.py export.zip --user <uid>
+# Aggregates are staged in a TEMP table of the importing connection, so a failed import
+# leaves earlier data untouched; a re-import replaces that user's data from the same source
+# in one transaction at the end. Apple Health merges devices that record the same thing:
+# for summed metrics each day keeps the single device (sourceName) with the largest total,
+# e.g. the Watch's steps rather than Watch plus iPhone, and overlapping sleep intervals
+# from several devices are merged before their hours are summed. daily_metrics applies
+# the same rule across sources, e.g. Apple Health and Oura sleep on the same night.
+
+import argparse  # Command-line interface
+import io  # Byte-counting stream wrapper
+import logging  # Logging for error handling and debugging
+import os  # File sizes
+import xml.etree.ElementTree as ET  # Incremental XML parsing
+import zipfile  # Apple Health export.zip archives
+from datetime import datetime, timedelta  # Record timestamps
+
+import pandas as pd  # Chunked CSV reading
+
+from db import DB_PATH, connect
+
+logger = logging.getLogger(__name__)
+
+BATCH_DAYS = 5000  # Flush aggregates once this many (day, metric) keys are pending
+CSV_CHUNK_ROWS = 50000
+
+# How each metric's daily samples combine: summed (durations, counts) or averaged (readings)
+METRIC_AGGREGATION = {
+    "sleep_hours": "sum",
+    "exercise_minutes": "sum",
+    "steps": "sum",
+    "bmi": "mean",
+    "weight_kg": "mean",
+    "systolic_bp": "mean",
+    "resting_hr": "mean",
+}
+
+# Apple Health quantity types -> (metric, unit conversion)
+APPLE_QUANTITIES = {
+    "HKQuantityTypeIdentifierAppleExerciseTime": ("exercise_minutes", lambda v, unit: v),
+    "HKQuantityTypeIdentifierStepCount": ("steps", lambda v, unit: v),
+    "HKQuantityTypeIdentifierBodyMassIndex": ("bmi", lambda v, unit: v),
+    "HKQuantityTypeIdentifierBodyMass": ("weight_kg", lambda v, unit: v * 0.45359237 if unit == "lb" else v),
+    "HKQuantityTypeIdentifierBloodPressureSystolic": ("systolic_bp", lambda v, unit: v),
+    "HKQuantityTypeIdentifierRestingHeartRate": ("resting_hr", lambda v, unit: v),
+}
+APPLE_SLEEP_TYPE = "HKCategoryTypeIdentifierSleepAnalysis"
+APPLE_DATE_FORMAT = "%Y-%m-%d %H:%M:%S %z"
+
+
+def _hms_to_minutes(value):
+    """Garmin "hh:mm:ss" durations to minutes."""
+    parts = [float(p) for p in str(value).split(":")]
+    while len(parts) < 3:
+        parts.insert(0, 0.0)
+    return parts[0] * 60 + parts[1] + parts[2] / 60
+
+
+# CSV presets: the date column and value columns -> (metric, conversion)
+CSV_PRESETS = {
+    "oura": {
+        "date": "date",
+        "columns": {
+            "Total Sleep Duration": ("sleep_hours", lambda v: float(v) / 3600),
+            "Steps": ("steps", float),
+            "Average Resting Heart Rate": ("resting_hr", float),
+        },
+    },
+    "garmin": {
+        "date": "Date",
+        "columns": {
+            "Time": ("exercise_minutes", _hms_to_minutes),
+        },
+    },
+}
+
+
+def create_biomarker_table(conn):
+    """Create the per-day biomarker table if missing."""
+    conn.execute('''CREATE TABLE IF NOT EXISTS biomarkers
+                    (user_id TEXT, day TEXT, metric TEXT, source TEXT, total REAL, samples INTEGER,
+                     PRIMARY KEY (user_id, metric, day, source)) WITHOUT ROWID''')
+    conn.commit()
+
+
+def daily_metrics(conn, user_id, metrics=None):
+    """Per-day values for a user as a DataFrame indexed by day, one column per metric.
+
+    Sources are merged like devices within an import: a summed metric takes the source
+    with the largest daily total (Apple Health and Oura both count the same night's
+    sleep), and an averaged one pools every source's samples.
+    """
+    df = pd.read_sql("SELECT day, metric, MAX(total) AS largest, SUM(total) AS total, SUM(samples) AS samples "
+                     "FROM biomarkers WHERE user_id = ? GROUP BY day, metric", conn, params=[user_id])
+    if df.empty:
+        return pd.DataFrame()
+    means = df["metric"].map(METRIC_AGGREGATION).eq("mean")
+    df["value"] = df["largest"].where(~means, df["total"] / df["samples"])
+    wide = df.pivot(index="day", columns="metric", values="value").sort_index()
+    return wide[[m for m in metrics if m in wide.columns]] if metrics else wide
+
+
+# =======================
+# Aggregation and Writing
+# =======================
+class _CountingReader(io.RawIOBase):
+    """Wraps a binary stream and reports bytes consumed, for progress on streaming parses."""
+
+    def __init__(self, raw, on_read):
+        self._raw, self._on_read, self.count = raw, on_read, 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._raw.read(len(buffer))
+        buffer[:len(data)] = data
+        self.count += len(data)
+        self._on_read(self.count)
+        return len(data)
+
+
+class _DailyWriter:
+    """Accumulates (day, metric, origin) -> (total, samples), staging it in a TEMP table until commit().
+
+    `origin` names the device or app a sample came from within one source (Apple
+    Health's sourceName). Needs a connection of its own: TEMP tables are per connection.
+    """
+
+    def __init__(self, conn, user_id, source):
+        self.conn, self.user_id, self.source = conn, user_id, source
+        self.pending = {}
+        self.records = 0
+        create_biomarker_table(conn)
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS temp.biomarker_staging")
+            conn.execute("CREATE TEMP TABLE biomarker_staging (day TEXT, metric TEXT, origin TEXT, total REAL, "
+                         "samples INTEGER, PRIMARY KEY (day, metric, origin)) WITHOUT ROWID")
+
+    def add(self, day, metric, value, origin=""):
+        total, samples = self.pending.get((day, metric, origin), (0.0, 0))
+        self.pending[(day, metric, origin)] = (total + value, samples + 1)
+        self.records += 1
+        if len(self.pending) >= BATCH_DAYS:
+            self.flush()
+
+    def flush(self):
+        """Upsert pending aggregates into the staging table, merging with rows flushed earlier."""
+        if not self.pending:
+            return
+        rows = [(day, metric, origin, total, samples) for (day, metric, origin), (total, samples) in self.pending.items()]
+        with self.conn:  # Only the TEMP database is written, so writers of community.db are not blocked
+            self.conn.executemany(
+                "INSERT INTO temp.biomarker_staging (day, metric, origin, total, samples) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (day, metric, origin) DO UPDATE SET "
+                "total = total + excluded.total, samples = samples + excluded.samples", rows)
+        self.pending = {}
+
+    def commit(self):
+        """Replace the user's earlier data from this source with the staged data, in one transaction."""
+        self.flush()
+        means = [metric for metric, how in METRIC_AGGREGATION.items() if how == "mean"]
+        marks = ", ".join("?" * len(means))
+        with self.conn:
+            self.conn.execute("DELETE FROM biomarkers WHERE user_id = ? AND source = ?", (self.user_id, self.source))
+            # Summed metrics: the origin with the largest daily total (SQLite takes `samples` from the MAX row)
+            self.conn.execute(
+                "INSERT INTO biomarkers (user_id, day, metric, source, total, samples) "
+                f"SELECT ?, day, metric, ?, MAX(total), samples FROM temp.biomarker_staging "
+                f"WHERE metric NOT IN ({marks}) GROUP BY day, metric", [self.user_id, self.source, *means])
+            # Averaged readings: every origin's samples count
+            self.conn.execute(
+                "INSERT INTO biomarkers (user_id, day, metric, source, total, samples) "
+                f"SELECT ?, day, metric, ?, SUM(total), SUM(samples) FROM temp.biomarker_staging "
+                f"WHERE metric IN ({marks}) GROUP BY day, metric", [self.user_id, self.source, *means])
+        self.close()
+
+    def close(self):
+        """Drop the staging table; without commit() the import is discarded."""
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS temp.biomarker_staging")
+
+
+def _merged_hours_by_day(intervals):
+    """Union overlapping (start, end) intervals and sum their hours by the day each ends on."""
+    hours = {}
+    current = None
+    for start, end in sorted(intervals) + [(None, None)]:
+        if current is not None and start is not None and start <= current[1]:
+            current = (current[0], max(current[1], end))
+            continue
+        if current is not None:
+            day = current[1].date().isoformat()  # A night is attributed to the day it ends on
+            hours[day] = hours.get(day, 0.0) + (current[1] - current[0]) / timedelta(hours=1)
+        current = (start, end)
+    return hours
+
+
+# =======================
+# Parsers
+# =======================
+def _open_apple_export(fileobj):
+    """Return a binary stream of export.xml, unwrapping an export.zip if needed."""
+    head = fileobj.read(4)
+    fileobj.seek(0)
+    if head != b"PK\x03\x04":
+        return fileobj, None
+    archive = zipfile.ZipFile(fileobj)
+    name = next((n for n in archive.namelist() if n.endswith("export.xml")), None)
+    if name is None:
+        raise ValueError("No export.xml found in the Apple Health archive.")
+    return archive.open(name), archive.getinfo(name).file_size
+
+
+def import_apple_health(conn, user_id, fileobj, progress=None, total_bytes=None):
+    """Stream an Apple Health export into the biomarker store; returns records imported."""
+    stream, unzipped_size = _open_apple_export(fileobj)
+    total_bytes = unzipped_size or total_bytes
+    writer = _DailyWriter(conn, user_id, "apple_health")
+    sleep = []  # Asleep intervals from every device, merged at the end (a few per night)
+
+    def on_read(count):
+        if progress and total_bytes:
+            progress(min(count / total_bytes, 1.0))
+
+    try:
+        reader = io.BufferedReader(_CountingReader(stream, on_read), 1 << 20)
+        depth, root = 0, None
+        for event, elem in ET.iterparse(reader, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if root is None:
+                    root = elem
+                continue
+            depth -= 1
+            # Only top-level records: those nested in correlations duplicate top-level ones
+            if depth == 1 and elem.tag == "Record":
+                _apple_record(writer, elem.attrib, sleep)
+            if depth == 1:
+                root.clear()  # Drop processed elements so memory does not grow with the file
+        for day, hours in _merged_hours_by_day(sleep).items():
+            writer.add(day, "sleep_hours", hours)
+        writer.commit()
+    except BaseException:
+        writer.close()
+        raise
+    return writer.records
+
+
+def _apple_record(writer, attrib, sleep):
+    """Map one Apple Health <Record> onto a daily metric, or collect its sleep interval."""
+    record_type = attrib.get("type")
+    try:
+        if record_type == APPLE_SLEEP_TYPE:
+            if "Asleep" not in attrib.get("value", ""):
+                return  # In-bed and awake intervals are not sleep
+            sleep.append((datetime.strptime(attrib["startDate"], APPLE_DATE_FORMAT),
+                          datetime.strptime(attrib["endDate"], APPLE_DATE_FORMAT)))
+        elif record_type in APPLE_QUANTITIES:
+            metric, convert = APPLE_QUANTITIES[record_type]
+            writer.add(attrib["startDate"][:10], metric, convert(float(attrib["value"]), attrib.get("unit")),
+                       attrib.get("sourceName", ""))
+    except (KeyError, ValueError) as e:
+        logger.warning(f"Skipping malformed Apple Health record: {str(e)}")
+
+
+def detect_csv_preset(columns):
+    """Pick the CSV preset whose date column and at least one value column are present."""
+    for name, preset in CSV_PRESETS.items():
+        if preset["date"] in columns and any(c in columns for c in preset["columns"]):
+            return name
+    raise ValueError("Unrecognized CSV export: expected an Oura or Garmin export.")
+
+
+def import_csv(conn, user_id, fileobj, preset=None, progress=None, total_bytes=None):
+    """Read an Oura/Garmin CSV in chunks into the biomarker store; returns records imported."""
+    header = pd.read_csv(fileobj, nrows=0).columns
+    fileobj.seek(0)
+    preset = preset or detect_csv_preset(header)
+    spec = CSV_PRESETS[preset]
+    value_columns = [c for c in spec["columns"] if c in header]
+    writer = _DailyWriter(conn, user_id, preset)
+    try:
+        for chunk in pd.read_csv(fileobj, usecols=[spec["date"]] + value_columns, chunksize=CSV_CHUNK_ROWS,
+                                 dtype=str):
+            days = pd.to_datetime(chunk[spec["date"]], errors="coerce").dt.strftime("%Y-%m-%d")
+            for column in value_columns:
+                metric, convert = spec["columns"][column]
+                for day, raw in zip(days, chunk[column]):
+                    if pd.isna(day) or pd.isna(raw) or raw == "--":
+                        continue
+                    try:
+                        writer.add(day, metric, convert(raw.replace(",", "")))
+                    except ValueError:
+                        continue
+            if progress and total_bytes:
+                progress(min(fileobj.tell() / total_bytes, 1.0))
+        writer.commit()
+    except BaseException:
+        writer.close()
+        raise
+    return writer.records
+
+
+def import_file(conn, user_id, fileobj, name, progress=None, total_bytes=None):
+    """Import an uploaded or opened export, choosing the parser from its file name."""
+    if name.lower().endswith(".csv"):
+        return import_csv(conn, user_id, fileobj, progress=progress, total_bytes=total_bytes)
+    if name.lower().endswith((".xml", ".zip")):
+        return import_apple_health(conn, user_id, fileobj, progress=progress, total_bytes=total_bytes)
+    raise ValueError(f"Unsupported file type: {name}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Import Apple Health, Oura or Garmin exports.")
+    parser.add_argument("path", help="export.zip, export.xml or a CSV export")
+    parser.add_argument("--user", required=True, help="Anonymous user id (the uid in the app URL)")
+    parser.add_argument("--db", default=DB_PATH, help="Path to community.db")
+    args = parser.parse_args()
+    last = [-1]
+
+    def report(fraction):
+        percent = int(fraction * 100)
+        if percent != last[0]:
+            last[0] = percent
+            print(f"\rImporting... {percent}%", end="", flush=True)
+
+    with open(args.path, "rb") as f:
+        count = import_file(connect(args.db), args.user, f, args.path, report, os.path.getsize(args.path))
+    print(f"\nImported {count} records.")